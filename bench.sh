@@ -0,0 +1,15 @@
+#!/bin/bash
+
+# usage: ./bench.sh [name ...]   (default: every benchmark in bench/)
+
+cd "$(dirname "$0")" || exit 1
+names=("$@")
+if [ ${#names[@]} -eq 0 ]; then
+    for f in bench/*.py; do
+        names+=("$(basename "$f" .py)")
+    done
+fi
+for name in "${names[@]}"; do
+    echo "== $name"
+    python3.14 -m "bench.$name"
+done
@@ -0,0 +1,59 @@
+"""
+1,000 players added one at a time, each followed by the prune/selection/overlap recompute
+that `!available` runs, against one `add_players` batch and a single recompute.
+
+run from the repo root: python3.14 -m bench.batch_add [--players N]
+"""
+import argparse
+import random
+import time as timer
+from datetime import time, timedelta
+
+from intervals import get_common_start_time
+from players import AvailablePlayers
+from times import TimeRange
+from utils import time_today
+
+
+def recompute(players: AvailablePlayers) -> None:
+    """
+    What check_player_count does short of talking to discord
+    """
+    players.prune()
+    if len(players) >= players.players_needed:
+        get_common_start_time([tr for (tr, sel) in players.values() if sel])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=1000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    now = time_today(time(hour=12))
+    roster = []
+    for i in range(args.players):
+        tr = TimeRange("", now=now)
+        tr.start_time_available = now + timedelta(days=1, minutes=5 * rng.randrange(0, 144))
+        tr.duration_available = timedelta(minutes=5 * rng.randrange(6, 48))
+        roster.append((i, tr))
+
+    one_at_a_time = AvailablePlayers()
+    start = timer.perf_counter()
+    for player, tr in roster:
+        one_at_a_time.add_player(player, tr)
+        recompute(one_at_a_time)
+    took_single = timer.perf_counter() - start
+
+    batched = AvailablePlayers()
+    start = timer.perf_counter()
+    batched.add_players(roster)
+    recompute(batched)
+    took_batch = timer.perf_counter() - start
+
+    assert len(one_at_a_time.lobby_assignments()) > 0 and len(batched.lobby_assignments()) > 0
+    print(f"one at a time: {took_single * 1e3:8.1f} ms ({len(one_at_a_time.lobby_assignments())} lobbies)")
+    print(f"      batched: {took_batch * 1e3:8.1f} ms ({len(batched.lobby_assignments())} lobbies)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+How many games the pool gets packed into, and how long packing takes, for 10 to 10k players.
+
+"one game" is what the bot did before lobbies. "first come" seats the first `size` people
+free at each start time in the order they posted, instead of the ones who leave soonest.
+
+run from the repo root: python3.14 -m bench.lobbies [--size N]
+"""
+import argparse
+import random
+import time as timer
+from datetime import datetime, time, timedelta
+
+from lobbies import Lobbies, pack
+from times import TimeRange
+from utils import time_today
+
+
+def random_pool(n: int, now: datetime, rng: random.Random) -> dict[int, TimeRange]:
+    pool = {}
+    for i in range(n):
+        tr = TimeRange("", now=now)
+        tr.start_time_available = now + timedelta(minutes=5 * rng.randrange(0, 144))  # sometime in the next 12 hours
+        tr.duration_available = timedelta(minutes=5 * rng.randrange(6, 48))  # for 30 minutes to 4 hours
+        pool[i] = tr
+    return pool
+
+
+def first_come(pool: dict[int, TimeRange], size: int) -> int:
+    seated: set[int] = set()
+    games = 0
+    for t in sorted({tr.start_time_available for tr in pool.values()}):
+        free = [u for u, tr in pool.items() if u not in seated and tr.time_in_range(t)]
+        while len(free) >= size:
+            seated.update(free[:size])
+            free = free[size:]
+            games += 1
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    now = time_today(time(hour=12))
+    print(f"{'players':>8} {'bound':>6} {'one game':>9} {'first come':>11} {'packed':>7} {'pack time':>10} {'add one':>9}")
+    for n in [10, 100, 1000, 10_000]:
+        pool = random_pool(n, now, rng)
+        start = timer.perf_counter()
+        lobbies, _rest = pack(pool, args.size)
+        took = timer.perf_counter() - start
+        naive = first_come(pool, args.size) if n <= 1000 else None
+        # incremental: a new player only gets packed with the people still waiting
+        incremental = Lobbies(args.size)
+        incremental.add_many(pool.items())
+        extra = random_pool(20, now, rng)
+        start = timer.perf_counter()
+        for i, tr in extra.items():
+            incremental.add(n + i, tr)
+        add_one = (timer.perf_counter() - start) / len(extra)
+        print(f"{n:>8} {n // args.size:>6} {min(1, n // args.size):>9} {naive if naive is not None else '-':>11} {len(lobbies):>7}"
+              f" {took * 1e3:>7.2f} ms {add_one * 1e3:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
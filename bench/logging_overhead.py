@@ -0,0 +1,44 @@
+"""
+Per-command cost of logging at INFO vs DEBUG.
+
+run from the repo root: python3.14 -m bench.logging_overhead
+"""
+import asyncio
+import logging
+import os
+import time
+
+from fake_discord import FakeChannel, FakeGuild, FakeMessage, FakeUser
+from log_setup import setup_logging
+from command_handlers import handle_available, handle_status, handle_unavailable
+
+ROUNDS = 2000
+
+
+async def run_commands(channel: FakeChannel, rounds: int) -> float:
+    user = FakeUser("bench")
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await handle_available(FakeMessage("!available for 2 hours", user, channel), "for 2 hours")
+        await handle_status(FakeMessage("!status", user, channel), "")
+        await handle_unavailable(FakeMessage("!unavailable", user, channel), "")
+        channel.sent.clear()
+    return (time.perf_counter() - start) / (rounds * 3)
+
+
+def main():
+    channel = FakeChannel(FakeGuild())
+    with open(os.devnull, "w") as devnull:
+        results = {}
+        for level in (logging.INFO, logging.DEBUG):
+            listener = setup_logging(level, logging.StreamHandler(devnull))
+            asyncio.run(run_commands(channel, ROUNDS // 10))  # warm up
+            results[level] = asyncio.run(run_commands(channel, ROUNDS))
+            listener.stop()
+    for level, per_command in results.items():
+        print(f"{logging.getLevelName(level):>5}: {per_command * 1e6:8.1f} us/command")
+    print(f"DEBUG overhead: {(results[logging.DEBUG] / results[logging.INFO] - 1) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
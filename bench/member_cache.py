@@ -0,0 +1,87 @@
+"""
+Memory and "startup" time of caching a big guild's member list (what chunking does at READY)
+against low-memory mode, where only the people who post commands are remembered.
+
+run from the repo root: python3.14 -m bench.member_cache [--members N]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+import discord
+
+from fake_discord import FakeGuild, FakeUser
+from user_cache import NameCache
+
+POSTERS = 40  # people who actually use the bot in a day
+COMMANDS = 500
+
+
+class StubState:
+    """
+    Just enough of discord.py's ConnectionState to build Member objects from payloads
+    """
+
+    def __init__(self):
+        self.users: dict[int, discord.User] = {}
+
+    def store_user(self, data) -> discord.User:
+        user = discord.User(state=self, data=data)  # pyright: ignore[reportArgumentType]
+        self.users[user.id] = user
+        return user
+
+
+def member_payload(i: int) -> dict:
+    return {
+        "user": {"id": str(10**17 + i), "username": f"member{i}", "discriminator": "0", "avatar": None, "global_name": None},
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "flags": 0,
+    }
+
+
+def full_cache(members: int) -> tuple[int, float]:
+    """
+    What discord.py keeps after chunking: a Member (and its User) per guild member
+    """
+    state, guild = StubState(), FakeGuild()
+    cache: dict[int, discord.Member] = {}
+    start = time.perf_counter()
+    for i in range(members):
+        member = discord.Member(data=member_payload(i), guild=guild, state=state)  # pyright: ignore[reportArgumentType]
+        cache[member.id] = member
+    took = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    return peak, took
+
+
+def low_memory(members: int) -> tuple[int, float]:
+    """
+    Nothing at startup, then a name per person who posts
+    """
+    names = NameCache()
+    posters = [FakeUser(f"member{i}", 10**17 + i) for i in random.sample(range(members), POSTERS)]
+    start = time.perf_counter()
+    for _ in range(COMMANDS):
+        names.remember(random.choice(posters))
+    took = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    return peak, took
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=50_000)
+    args = parser.parse_args()
+    for label, f in [("full member cache", full_cache), ("low-memory mode", low_memory)]:
+        gc.collect()
+        tracemalloc.start()
+        peak, took = f(args.members)
+        tracemalloc.stop()
+        print(f"{label:>18}: {peak / 2**20:8.2f} MiB peak, {took * 1000:8.1f} ms building the cache")
+
+
+if __name__ == "__main__":
+    main()
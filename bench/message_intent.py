@@ -0,0 +1,93 @@
+"""
+Events handled and CPU spent per hour of traffic with "!" commands (every message in
+every channel reaches on_message) vs slash commands (only the commands reach us).
+
+run from the repo root: python3.14 -m bench.message_intent [--trace FILE] [--per-second N]
+
+--trace replays the "text" of each line of a (optionally gzipped) JSONL file instead
+of the synthetic chatter.
+"""
+import argparse
+import asyncio
+import gzip
+import itertools
+import json
+import time
+from collections.abc import Iterator
+
+import discord
+
+from fake_discord import FakeChannel, FakeGuild, FakeInteraction, FakeMessage, FakeUser
+from guild_state import g_guild_states
+from main import on_message
+from slash_commands import run_slash_command
+
+CHATTER = ["lol", "anyone on?", "gg", "brb", "that was close", "who's hosting", "ok", "nice"]
+COMMANDS = ["!available for 2 hours", "!status", "!unavailable"]
+
+
+def synthetic_traffic(per_second: float, command_share: float = 0.01) -> Iterator[str]:
+    """
+    One hour of a busy server: mostly chatter, with a command every 1/command_share messages
+    """
+    every = round(1 / command_share)
+    commands = itertools.cycle(COMMANDS)
+    chatter = itertools.cycle(CHATTER)
+    for i in range(int(per_second * 60 * 60)):
+        yield next(commands) if i % every == 0 else next(chatter)
+
+
+def trace_traffic(path: str) -> Iterator[str]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        for line in f:
+            record = json.loads(line)
+            if "text" in record:
+                yield record["text"]
+
+
+async def prefix_mode(texts: list[str], channel: FakeChannel, user: FakeUser) -> int:
+    client = discord.Client(intents=discord.Intents.default())
+    client.event(on_message)
+    client.loop = asyncio.get_running_loop()  # normally set when logging in
+    before = set(asyncio.all_tasks())
+    for text in texts:
+        # what discord.py does for each MESSAGE_CREATE: one task per event
+        client.dispatch("message", FakeMessage(text, user, channel))
+    await asyncio.gather(*(asyncio.all_tasks() - before - {asyncio.current_task()}))
+    return len(texts)
+
+
+async def slash_mode(texts: list[str], channel: FakeChannel, user: FakeUser) -> int:
+    events = 0
+    for text in texts:
+        if not text.startswith("!"):
+            continue  # discord never sends us these
+        name, _, args = text.removeprefix("!").partition(" ")
+        await run_slash_command(FakeInteraction(user, channel), name, args)  # pyright: ignore[reportArgumentType]
+        events += 1
+    return events
+
+
+def measure(mode, texts: list[str]) -> tuple[int, float]:
+    g_guild_states.clear()
+    channel = FakeChannel(FakeGuild())
+    start = time.process_time()
+    events = asyncio.run(mode(texts, channel, FakeUser("bench")))
+    return events, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trace", help="JSONL file of recorded messages with a 'text' field")
+    parser.add_argument("--per-second", type=float, default=3.0, help="synthetic messages per second")
+    args = parser.parse_args()
+    texts = list(trace_traffic(args.trace) if args.trace else synthetic_traffic(args.per_second))
+    print(f"{len(texts)} messages, {sum(t.startswith('!') for t in texts)} of them commands")
+    for label, mode in [("prefix (message content)", prefix_mode), ("slash commands", slash_mode)]:
+        events, cpu = measure(mode, texts)
+        print(f"{label:>25}: {events:>7} events, {cpu * 1000:8.1f} ms cpu")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Telling a 100-player lobby its time was agreed and then that it's starting: one DM at a time
+against the notifier's bounded fan-out with consolidation.
+
+run from the repo root: python3.14 -m bench.notify [--players N] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import time
+
+from fake_discord import FakeUser
+from notifier import Notifier
+
+EVENTS = ["Your game starts at 19:00", "Time to play!"]
+
+
+class SlowUser(FakeUser):
+    latency: float = 0.05
+    calls: int = 0
+
+    async def send(self, content: str):
+        SlowUser.calls += 1
+        await asyncio.sleep(self.latency)
+        return await super().send(content)
+
+
+async def sequential(users: list[SlowUser]) -> None:
+    for text in EVENTS:
+        for u in users:
+            await u.send(text)
+
+
+async def fanned_out(users: list[SlowUser], concurrency: int) -> None:
+    by_id = {u.id: u for u in users}
+
+    async def get_user(user_id: int) -> SlowUser:
+        return by_id[user_id]
+
+    notifier = Notifier(concurrency=concurrency, window=0.01, get_user=get_user)
+    for i, text in enumerate(EVENTS):
+        notifier.notify(by_id, text, i)
+    await notifier.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    SlowUser.latency = args.latency
+    users = [SlowUser(f"p{i}") for i in range(args.players)]
+    runs = [("sequential", lambda: sequential(users))]
+    runs += [(f"fan-out x{c}", lambda c=c: fanned_out(users, c)) for c in [5, 10, 25]]
+    for label, run in runs:
+        SlowUser.calls = 0
+        start = time.perf_counter()
+        asyncio.run(run())
+        took = time.perf_counter() - start
+        print(f"{label:>14}: {took:6.2f} s, {SlowUser.calls} API calls")
+
+
+if __name__ == "__main__":
+    main()
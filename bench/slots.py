@@ -0,0 +1,51 @@
+"""
+Overlap questions answered with datetimes (what players.py/times.py do today) vs slot bitmaps.
+
+run from the repo root: python3.14 -m bench.slots
+"""
+import random
+import timeit
+from datetime import datetime, time, timedelta
+
+from slots import SlotCounter, SlotWindow, common_start_time
+from times import TimeRange
+from utils import time_today
+
+
+def random_ranges(n: int, now: datetime, rng: random.Random) -> list[TimeRange]:
+    ranges = []
+    for _ in range(n):
+        tr = TimeRange("", now=now)
+        tr.start_time_available = now + timedelta(minutes=5 * rng.randrange(0, 200))
+        tr.duration_available = timedelta(minutes=5 * rng.randrange(6, 100))
+        ranges.append(tr)
+    return ranges
+
+
+def headcounts_datetime(ranges: list[TimeRange], window: SlotWindow) -> list[int]:
+    out = []
+    for s in range(window.slots):
+        t = window.time_of(s)
+        out.append(sum(1 for tr in ranges if tr.time_in_range(t)))
+    return out
+
+
+def main():
+    rng = random.Random(0)
+    now = time_today(time(hour=12))
+    window = SlotWindow(now)
+    print(f"{'players':>8} {'common start (datetime)':>24} {'(bitmap)':>10} {'headcounts (datetime)':>22} {'(bitmap)':>10}")
+    for n in [10, 100, 1000]:
+        ranges = random_ranges(n, now, rng)
+        bitmaps = [window.bitmap(tr) for tr in ranges]
+        number = max(1, 2000 // n)
+        t_common_dt = min(timeit.repeat(lambda: TimeRange.get_common_start_time(ranges), number=number, repeat=3)) / number
+        t_common_bm = min(timeit.repeat(lambda: common_start_time(ranges, window), number=number, repeat=3)) / number
+        heads_number = max(1, number // 20)
+        t_heads_dt = min(timeit.repeat(lambda: headcounts_datetime(ranges, window), number=heads_number, repeat=3)) / heads_number
+        t_heads_bm = min(timeit.repeat(lambda: SlotCounter(bitmaps).counts(window.slots), number=heads_number, repeat=3)) / heads_number
+        print(f"{n:>8} {t_common_dt * 1e6:>21.1f} us {t_common_bm * 1e6:>7.1f} us {t_heads_dt * 1e3:>19.2f} ms {t_heads_bm * 1e3:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
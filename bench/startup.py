@@ -0,0 +1,52 @@
+"""
+Startup time: wall clock for importing the bot (and just the parsing modules the
+tests use), plus the slowest imports according to `-X importtime`.
+
+run from the repo root: python3.14 -m bench.startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+TARGETS = {
+    "bot (import main)": "import main",
+    "tests (import times, players)": "import times, players",
+}
+
+
+def time_import(statement: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(statement: str, n: int = 10) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], check=True, capture_output=True, text=True
+    )
+    rows: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:  # what the target imports directly, deeper imports are counted in their parent
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    baseline = statistics.median(time_import("pass") for _ in range(RUNS))
+    print(f"interpreter alone: {baseline * 1000:.1f} ms")
+    for label, statement in TARGETS.items():
+        median = statistics.median(time_import(statement) for _ in range(RUNS))
+        print(f"{label}: {median * 1000:.1f} ms (+{(median - baseline) * 1000:.1f} ms)")
+        for cumulative, name in slowest_imports(statement):
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Does resolving a guild's zone cost anything next to parsing?
+Compares parsing in the default zone against looking up a per-user zone and parsing inside
+`use_tz`. Both use the same zone so the parser takes the same path through the same inputs.
+
+run from the repo root: python3.14 -m bench.timezone
+"""
+import timeit
+
+from guild_state import GuildState
+from times import TimeRange
+from datetime import time
+
+from utils import TZ, time_today, use_tz
+
+INPUTS = ["7-9", "until 11", "in 30 min for 2 hours", "from 7:30 to 10", ""]
+NUMBER = 5000
+
+
+def main():
+    state = GuildState(1)
+    state.set_timezone("Asia/Tokyo")
+    state.set_timezone(TZ.key, user_id=42)
+    now = time_today(time(hour=12))
+
+    def default_zone():
+        for s in INPUTS:
+            TimeRange(s, now=now)
+
+    def guild_zone():
+        for s in INPUTS:
+            zone = state.zone_for(42)
+            with use_tz(zone):
+                TimeRange(s, now=now.astimezone(zone))
+
+    # interleave the two so clock speed changes hit both equally
+    results: dict[str, float] = {"default zone": float("inf"), "per-user zone": float("inf")}
+    for _ in range(20):
+        for name, f in [("default zone", default_zone), ("per-user zone", guild_zone)]:
+            took = timeit.timeit(f, number=NUMBER // len(INPUTS) // 20) / (NUMBER // 20)
+            results[name] = min(results[name], took)
+    for name, took in results.items():
+        print(f"{name:>14}: {took * 1e6:6.2f} us/parse")
+    lookup = min(timeit.repeat(lambda: state.zone_for(42), number=100_000, repeat=5)) / 100_000
+    print(f"zone lookup alone: {lookup * 1e9:.0f} ns")
+    print(f"difference: {(results['per-user zone'] / results['default zone'] - 1) * 100:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,33 @@
 import asyncio
 import math
+import re
 import logging
 
 from collections import OrderedDict
 from datetime import datetime
 from types import CoroutineType
-from discord_globals import client
+import discord_globals
 
-from times import TimeRange
+from intervals import get_common_start_time, parse_availability
 import discord
-from discord import Member, Message, Reaction
+from discord import Message, Reaction
 from discord.abc import User
-from utils import get_now_rounded, get_now, fmt_dt, TimeSyntaxError
+from players import Availability, UserId
+from user_cache import display_name, mention, remember_user
+from utils import get_now_rounded, get_now, fmt_dt, use_tz, TimeSyntaxError
+from zoneinfo import ZoneInfoNotFoundError
 from typing import Protocol, Callable
 
-from players import g_available_players
-
-from globals import (
-    g_confirmed_start_time,
-    g_debug_mode,
-    g_players_needed,
-    g_waiting,
-)
+from guild_state import GuildState, get_guild_state, g_guild_states
 from message_utils import (
-    get_channel,
-    set_channel,
     send,
     debug_log,
+    is_admin,
 )
+from metrics import PARSE_SECONDS, POOL_PLAYERS, render
+from notifier import notify
+import scheduler
+from scheduler import Reminder, g_scheduler
 
 logger = logging.getLogger(__name__)
 G_PREFIX = "!"
@@ -37,40 +37,52 @@ class CommandHandler(Protocol):
     def __call__(self, message: discord.Message, _args: str) -> CoroutineType[Message, str, None]: ...
 
 
+async def get_state(message: Message) -> GuildState:
+    """
+    The state for the server this message came from, setting up the channel if that hasn't happened yet
+    """
+    assert message.guild is not None, "commands only come from guilds"
+    state = get_guild_state(message.guild.id)
+    if state.channel is None:
+        await setup_channel(state, message)
+    return state
 
-async def prune_players() -> None:
+
+async def prune_players(state: GuildState) -> None:
     logger.debug("function prune_players")
-    global g_available_players
-    await g_available_players.prune()
+    for m, tr in state.available_players.prune():
+        await debug_log(state, "pruning player %s (end time %s)", display_name(m), fmt_dt(tr.get_end_time_available()))
 
 
-async def announce_game_full() -> None:
+async def announce_game_full(state: GuildState) -> None:
     logger.debug("function announce_game_full")
-    if get_channel() is not None:
-        await debug_log("We have enough players, checking for common start time...")
-        t = TimeRange.get_common_start_time([tr for (tr, sel) in g_available_players.values() if sel])
+    if state.channel is not None:
+        await debug_log(state, "We have enough players, checking for common start time...")
+        t = get_common_start_time([tr for (tr, sel) in state.available_players.values() if sel])
         if t is not None:
-            await inform_available_players_of_agreed_time(t)
-            await inform_available_players_of_start(t)
+            await inform_available_players_of_agreed_time(state, t)
+            await inform_available_players_of_start(state, t)
         else:
-            await send("We have enough players, but their start times do not overlap")
+            await send(state, "We have enough players, but their start times do not overlap")
     else:
         logger.error("Need to set channel...")
 
 
-async def handle_extra_players() -> None:
+async def handle_extra_players(state: GuildState) -> None:
     logger.debug("function handle_extra_players")
-    selected: list[tuple[User, TimeRange]] = [(u, tr) for u, (tr, sel) in g_available_players.items() if sel]
-    unselected: list[tuple[User, TimeRange]] = [(u, tr) for u, (tr, sel) in g_available_players.items() if not sel]
-    if len(selected) < g_players_needed:
-        g_available_players.reselect_first_available_players()
-        await handle_extra_players() # retry function
+    players = state.available_players
+    selected: list[tuple[UserId, Availability]] = [(u, tr) for u, (tr, sel) in players.items() if sel]
+    unselected: list[tuple[UserId, Availability]] = [(u, tr) for u, (tr, sel) in players.items() if not sel]
+    if len(selected) < state.players_needed:
+        players.reselect_first_available_players()
+        await handle_extra_players(state) # retry function
         return
-    latest_selected_user: User = max(selected, key=lambda u: u[1].start_time_available)[0]
-    first_unselected_user: User = min(unselected, key=lambda u: u[1].start_time_available)[0]
-    other_selected = [p[0].mention for p in selected if p[0] != latest_selected_user]
+    latest_selected_user: UserId = max(selected, key=lambda u: u[1].start_time_available)[0]
+    first_unselected_user: UserId = min(unselected, key=lambda u: u[1].start_time_available)[0]
+    other_selected = [mention(p[0]) for p in selected if p[0] != latest_selected_user]
     msg = await send(
-        f"{' '.join(other_selected)} vote to replace {latest_selected_user.mention} with {first_unselected_user.mention}"
+        state,
+        f"{' '.join(other_selected)} vote to replace {mention(latest_selected_user)} with {mention(first_unselected_user)}"
     )
     if msg is None:
         logger.error("Failed to add send vote message somehow")
@@ -81,130 +93,179 @@ async def handle_extra_players() -> None:
     count_reactions: Callable[[Message, str], int] = lambda m, react: len([r for r in m.reactions if r.emoji == react])
 
     def vote_passes(reaction: Reaction, _user: User):
-        result = (c := count_reactions(reaction.message, yes)) > (n := math.ceil((g_players_needed - 1) / 2))
+        if reaction.message.id != msg.id:
+            return False
+        result = (c := count_reactions(reaction.message, yes)) > (n := math.ceil((state.players_needed - 1) / 2))
         if result:
-            logger.info(f"Got {c} reactions, vote passes")
+            logger.info("Got %d reactions, vote passes", c)
         else:
-            logger.info(f"Got reaction on message but only have {c} votes yes when we we need {n}")
+            logger.info("Got reaction on message but only have %d votes yes when we we need %d", c, n)
         return result
 
     try:
-        _result = await client.wait_for("reaction_add", check=vote_passes, timeout=(60 * 60 * 6))
+        _result = await discord_globals.client.wait_for("reaction_add", check=vote_passes, timeout=(60 * 60 * 6))
     except asyncio.TimeoutError:
         logger.info("timed out vote to replace")
         pass
     else:  # if we don't time out, then:
-        logger.info(f"replacing player {latest_selected_user} with {first_unselected_user}")
-        await send(f"replacing {latest_selected_user.mention} with {first_unselected_user.mention}")
-        g_available_players.deselect_player(latest_selected_user)
-        g_available_players.deselect_player(first_unselected_user)
-        await announce_game_full()
+        logger.info("replacing player %s with %s", latest_selected_user, first_unselected_user)
+        await send(state, f"replacing {mention(latest_selected_user)} with {mention(first_unselected_user)}")
+        players.deselect_player(latest_selected_user)
+        players.deselect_player(first_unselected_user)
+        await announce_game_full(state)
 
 
-async def check_player_count() -> None:
+async def check_player_count(state: GuildState) -> None:
     """
     Check if we have enough players, and handle it as needed
     """
     logger.debug("function check_player_count")
-    await prune_players()
-    if get_channel() is None:
+    await prune_players(state)
+    if state.channel is None:
         return
-    await debug_log("Checking player count")
+    await debug_log(state, "Checking player count")
 
-    if len(g_available_players) == g_players_needed:
-        await debug_log("Game full")
-        await announce_game_full()
-    elif len(g_available_players) > g_players_needed:
-        await debug_log("Handling extra players")
+    if len(state.available_players) == state.players_needed:
+        await debug_log(state, "Game full")
+        await announce_game_full(state)
+    elif len(state.available_players) > state.players_needed:
+        await debug_log(state, "Handling extra players")
         try:
-            await handle_extra_players()
+            await handle_extra_players(state)
         except:
             logger.error("Failed to create vote")
     else:
-        await debug_log(f"Not enough players. (need {g_players_needed}, have {len(g_available_players)} total)")
+        await debug_log(state, "Not enough players. (need %d, have %d total)", state.players_needed, len(state.available_players))
 
 
-async def get_current_available() -> list[tuple[Member, TimeRange]]:
+async def get_current_available(state: GuildState) -> list[tuple[UserId, Availability]]:
     logger.debug("function get_current_available")
-    global g_available_players
-    await prune_players()
+    await prune_players(state)
     out = []
-    for m, (tr, _sel) in g_available_players.items():
+    for m, (tr, _sel) in state.available_players.items():
         if tr.time_in_range(now := get_now_rounded()):
             out.append((m, tr))
-            await debug_log(f"Member {str(m)} available because {str(tr.start_time_available)} < {str(now)} < {str(tr.get_end_time_available())}")
+            await debug_log(state, "Member %s available because %s < %s < %s", display_name(m), tr.start_time_available, now, tr.get_end_time_available())
     return out
 
 
-async def count_current_available() -> int:
+async def count_current_available(state: GuildState) -> int:
     logger.debug("function count_current_available")
-    return len(await get_current_available())
+    return len(await get_current_available(state))
 
 
-async def get_mention_available_players(*, only_selected=False, only_unselected=False) -> list[str]:
+async def get_mention_available_players(state: GuildState, *, only_selected=False, only_unselected=False) -> list[str]:
     logger.debug("function get_mention_available_players")
-    global g_available_players
-    await prune_players()
+    await prune_players(state)
     return [
-        player.mention
-        for player, (_tr, sel) in g_available_players.items()
+        mention(player)
+        for player, (_tr, sel) in state.available_players.items()
         if (sel if only_selected else True)
         if (not sel if only_unselected else True)
     ]
 
 
-async def inform_available_players_of_start(t: datetime):
+async def inform_available_players_of_start(state: GuildState, t: datetime):
     logger.debug("function inform_available_players_of_start")
     """
     Contact everyone who says they'll play
     """
-    global g_waiting, g_confirmed_start_time, g_available_players, g_debug_mode
-    if get_channel() is None:
+    if state.channel is None:
         return
-    if g_waiting and g_confirmed_start_time == t:
+    if state.waiting and state.confirmed_start_time == t:
         return
-    g_confirmed_start_time = t
+    state.confirmed_start_time = t
     delay = (t - get_now()).total_seconds()
-    await debug_log(f"Waiting until {t} ({delay:.2f} seconds, current time is {get_now()})")
-    g_waiting = True
+    await debug_log(state, "Waiting until %s (%.2f seconds, current time is %s)", t, delay, get_now())
+    state.waiting = True
     if delay > 0:
         await asyncio.sleep(delay)
-    if g_confirmed_start_time != t:
+    if state.confirmed_start_time != t:
         return  # someone else took over
-    await send(f"{" ".join(await get_mention_available_players(only_selected=True))} time to play!")
-    g_confirmed_start_time = None
-    g_waiting = False
-    g_available_players.start_game()
+    await send(state, f"{" ".join(await get_mention_available_players(state, only_selected=True))} time to play!")
+    notify(state.available_players.selected_players, f"Time to play in {where(state)}!", ("start", state.guild_id, t))
+    state.confirmed_start_time = None
+    state.waiting = False
+    state.available_players.start_game()
 
 
-async def inform_available_players_of_agreed_time(t: datetime):
+async def inform_available_players_of_agreed_time(state: GuildState, t: datetime):
     logger.debug("function inform_available_players_of_agreed_time")
     """
     Contact everyone who says they'll play
     """
-    if get_channel() is None:
+    if state.channel is None:
         return
     await send(
-        f"{" ".join(await get_mention_available_players(only_selected=True))} start time has been set to {fmt_dt(t)}"
+        state,
+        f"{" ".join(await get_mention_available_players(state, only_selected=True))} start time has been set to {fmt_dt(t)}"
     )
+    notify(state.available_players.selected_players, f"Your game in {where(state)} starts at {fmt_dt(t)}", ("agreed", state.guild_id, t))
+    if scheduler.g_start_reminder is not None and (when := t - scheduler.g_start_reminder) > get_now():
+        for player in state.available_players.selected_players:
+            g_scheduler.schedule(when, ("start", state.guild_id, player), state.guild_id, player, f"your game starts at {fmt_dt(t)}")
+
+
+def schedule_end_reminder(state: GuildState, player: UserId, tr: Availability) -> None:
+    """
+    Let a backup know before their availability runs out
+    """
+    if scheduler.g_end_reminder is None or state.available_players.user_is_selected(player):
+        return
+    end = tr.get_end_time_available()
+    if (when := end - scheduler.g_end_reminder) > get_now():
+        g_scheduler.schedule(when, ("ends", state.guild_id, player), state.guild_id, player, f"your availability ends at {fmt_dt(end)}")
+
+
+def reminder_applies(state: GuildState, reminder: Reminder) -> bool:
+    players = state.available_players
+    match reminder.key:
+        case ("start", _, player):
+            return state.confirmed_start_time is not None and players.user_is_selected(player)
+        case ("ends", _, player):
+            return player in players.unselected_players
+    return True
+
+
+async def deliver_reminders(reminders: list[Reminder]) -> None:
+    """
+    One message per server for everything due this minute, with everyone sharing a reminder mentioned on one line
+    """
+    # guild id : text : players
+    grouped: dict[int, dict[str, list[UserId]]] = {}
+    for r in reminders:
+        state = g_guild_states.get(r.guild_id)
+        if state is not None and reminder_applies(state, r):
+            grouped.setdefault(r.guild_id, {}).setdefault(r.text, []).append(r.user_id)
+    for guild_id, texts in grouped.items():
+        state = g_guild_states[guild_id]
+        await send(state, "\n".join(f"{" ".join(mention(p) for p in players)} {text}" for text, players in texts.items()))
+        for text, players in texts.items():
+            notify(players, f"In {where(state)}: {text}", ("reminder", guild_id, text))
+
+
+g_scheduler.deliver = deliver_reminders
 
 
 async def handle_available(message: Message, _args: str) -> None:
     logger.debug("function handle_available")
-    global g_available_players
-    if get_channel() is None:
-        await handle_setup(message, "")
-    now = message.created_at.astimezone()
-    player = message.author
-    if player in g_available_players.playing_players:
-        await send(f"{" ".join(p.mention for p in g_available_players.playing_players if p != player)} game postponed due to {player.mention}.")
+    state = await get_state(message)
+    players = state.available_players
+    player = remember_user(message.author)
+    zone = state.zone_for(player)
+    now = message.created_at.astimezone(zone)
+    if player in players.playing_players:
+        await send(state, f"{" ".join(mention(p) for p in players.playing_players if p != player)} game postponed due to {mention(player)}.")
         return
 
     try:
-        g_available_players.add_player(player, TimeRange(_args, now=now))
-        await debug_log(f"Adding player: {player}")
+        with PARSE_SECONDS.time(), use_tz(zone):
+            tr = parse_availability(_args, now=now)
+        players.add_player(player, tr)
+        schedule_end_reminder(state, player, tr)
+        await debug_log(state, "Adding player: %s", message.author)
     except ValueError as e:
-        if g_debug_mode:
+        if state.debug_mode:
             await message.reply(f"These numbers don't look right: {e}")
         else:
             await message.reply("These numbers don't look right...")
@@ -212,130 +273,238 @@ async def handle_available(message: Message, _args: str) -> None:
         await message.reply(e.message)
     else:
         await message.add_reaction("👍")
-        await check_player_count()
+        await check_player_count(state)
 
 
 async def handle_unavailable(message: Message, _args: str) -> None:
     logger.debug("function handle_unavailable")
-    global g_available_players, g_confirmed_start_time
-    if get_channel() is None:
-        await handle_setup(message, "")
-    await prune_players()
-    player: User = message.author
+    state = await get_state(message)
+    players = state.available_players
+    await prune_players(state)
+    player: UserId = remember_user(message.author)
     emoji = "👋"
     # send message if it ruined a game
-    if player in g_available_players.playing_players:
+    if player in players.playing_players:
         emoji = "🖕"
-        if len(g_available_players) > 0:
-            await send(f"{" ".join(p.mention for p in g_available_players.playing_players if p != player)} Game delayed due to {player.mention}.\n{" ".join(p.mention for p in g_available_players.not_playing())} need a replacement!")
+        if len(players) > 0:
+            await send(state, f"{" ".join(mention(p) for p in players.playing_players if p != player)} Game delayed due to {mention(player)}.\n{" ".join(mention(p) for p in players.not_playing())} need a replacement!")
         else:
-            await send(f"{" ".join(p.mention for p in g_available_players.playing_players if p != player)} Game cancelled due to {player.mention}.")
+            await send(state, f"{" ".join(mention(p) for p in players.playing_players if p != player)} Game cancelled due to {mention(player)}.")
 
-    elif player not in g_available_players.keys():
+    elif player not in players.keys():
         await message.reply(f"We weren't expecting you!")
         return
-    user_was_selected: bool = g_available_players.user_is_selected(player)
-    g_available_players.delete(player) # delete em!
+    user_was_selected: bool = players.user_is_selected(player)
+    players.delete(player) # delete em!
 
     await message.add_reaction("🖕" if user_was_selected else emoji)
 
     if user_was_selected:
-        if len(g_available_players) == g_players_needed - 1:
-            g_confirmed_start_time = None
+        if len(players) == state.players_needed - 1:
+            state.confirmed_start_time = None
             other_selected_players: list[str] = [
-                player for player in await get_mention_available_players(only_selected=True) if player != player
+                m for m in await get_mention_available_players(state, only_selected=True) if m != mention(player)
             ]
-            await send(f"{' '.join(other_selected_players)} game has been cancelled due to {player.mention}.")
-        elif len(g_available_players) >= g_players_needed:
+            await send(state, f"{' '.join(other_selected_players)} game has been cancelled due to {mention(player)}.")
+            notify(players.selected_players, f"Your game in {where(state)} has been cancelled", ("cancelled", state.guild_id, message.id))
+        elif len(players) >= state.players_needed:
+
+            await send(state, f"replaced {mention(player)}")
+            players.reselect_first_available_players()
+            await check_player_count(state)
 
-            await send(f"replaced {player.mention}")
-            g_available_players.reselect_first_available_players()
-            await check_player_count()
+
+def where(state: GuildState) -> str:
+    """
+    The server and channel, for messages sent outside it
+    """
+    if state.channel is None:
+        return f"server {state.guild_id}"
+    return f"{state.channel.guild.name} #{state.channel.name}"
+
+
+async def setup_channel(state: GuildState, message: Message) -> None:
+    if isinstance(message.channel, discord.TextChannel):
+        state.channel = message.channel
+        logger.info("guild %d channel becomes message.channel=%r", state.guild_id, message.channel)
+        await send(state, f'the channel "{message.channel}" ({message.channel.id}) is now where I will be sending messages')
 
 
 async def handle_setup(message: Message, _args: str) -> None:
     logger.debug("function handle_setup")
-    if isinstance(message.channel, discord.TextChannel):
-        set_channel(message.channel)
-        logger.info(f"get_channel() becomes {message.channel=}: {get_channel()=}")
-        await send(f'the channel "{message.channel}" ({message.channel.id}) is now where I will be sending messages')
+    assert message.guild is not None, "commands only come from guilds"
+    await setup_channel(get_guild_state(message.guild.id), message)
 
 
 async def enable_debug(message: Message, _args: str) -> None:
     logger.debug("function enable_debug")
-    if get_channel() is None:
-        await handle_setup(message, "")
-    global g_debug_mode
-    g_debug_mode = True
-    await send("debug mode on")
+    state = await get_state(message)
+    state.debug_mode = True
+    await send(state, "debug mode on")
 
 
 async def disable_debug(message: Message, _args: str) -> None:
     logger.debug("function disable_debug")
-    if get_channel() is None:
-        await handle_setup(message, "")
-    global g_debug_mode
-    g_debug_mode = False
-    await send("debug mode off")
+    state = await get_state(message)
+    state.debug_mode = False
+    await send(state, "debug mode off")
 
 
 async def handle_count(message: Message, _args: str) -> None:
     logger.debug("function handle_count")
-    if get_channel() is None:
-        await handle_setup(message, "")
-    global g_players_needed
+    state = await get_state(message)
     if len(_args.strip()) == 0:
-        await message.reply(f"We need {g_players_needed} players")
+        await message.reply(f"We need {state.players_needed} players")
         return
     if not _args.isnumeric():
         await message.reply(f'Can\'t make a number out of "{_args}"')
     else:
-        g_players_needed = int(_args)
+        state.players_needed = int(_args)
         await message.reply(f'Players needed is now "{_args}"')
-        await check_player_count()
+        await check_player_count(state)
 
 
 async def handle_status(message: Message, _args: str) -> None:
-    global g_available_players
     logger.debug("function handle_status")
-    if get_channel() is None:
-        await handle_setup(message, "")
-    await prune_players()
-    s = f"({await count_current_available()}/{g_players_needed}) players currently available"
-    if g_confirmed_start_time is not None:
-        s += f"\nStart time confirmed for: {fmt_dt(g_confirmed_start_time)}"
-    if g_debug_mode:
-        s += f"\nDEBUG MODE ON\nCURRENT TIME {fmt_dt(get_now_rounded())}\n{f"{g_available_players=}\n{g_confirmed_start_time=}"}"
+    state = await get_state(message)
+    players = state.available_players
+    await prune_players(state)
+    s = f"({await count_current_available(state)}/{state.players_needed}) players currently available"
+    if state.confirmed_start_time is not None:
+        s += f"\nStart time confirmed for: {fmt_dt(state.confirmed_start_time)}"
+    if state.debug_mode:
+        s += f"\nDEBUG MODE ON\nCURRENT TIME {fmt_dt(get_now_rounded())}\n{f"{state=}\n{state.confirmed_start_time=}"}"
     available_emoji = "✅"
     unavailable_emoji = "❌"
-    # sel_players: list[tuple[User, TimeRange]] = [(m, tr) for m, (tr, sel) in g_available_players.items() if sel]
-    # unsel_players: list[tuple[User, TimeRange]] = [(m, tr) for m, (tr, sel) in g_available_players.items() if not sel]
-    sel_players = g_available_players.selected_players.items()
-    unsel_players = g_available_players.unselected_players.items()
-    playing_players = g_available_players.playing_players.items()
+    sel_players = players.selected_players.items()
+    unsel_players = players.unselected_players.items()
+    playing_players = players.playing_players.items()
     for m, tr in sel_players:
         emoji = available_emoji if tr.time_in_range(get_now()) else unavailable_emoji
-        s += f"\n{emoji} {m.name}: {str(tr)}"
+        s += f"\n{emoji} {display_name(m)}: {str(tr)}"
     if len(unsel_players) > 0:
         s += f"\nBackup players:"
         for m, tr in unsel_players:
             emoji = available_emoji if tr.time_in_range(get_now()) else unavailable_emoji
-            s += f"\n{emoji} {m.name}: {str(tr)}"
+            s += f"\n{emoji} {display_name(m)}: {str(tr)}"
     if len(playing_players) > 0:
         s += "\nCurrently playing:"
         for m, (tr, _) in playing_players:
-            s += f"\n{m.name}: {str(tr)}"
+            s += f"\n{display_name(m)}: {str(tr)}"
+    lobbies = players.lobby_assignments()
+    if len(lobbies) > 0:
+        s += f"\nEnough people for {len(lobbies)} game{"s" if len(lobbies) > 1 else ""}:"
+        for i, lobby in enumerate(lobbies, 1):
+            s += f"\nGame {i} at {fmt_dt(lobby.start)}: {", ".join(display_name(p) for p in lobby.players)}"
 
     await message.reply(s)
 
 
+async def handle_timezone(message: Message, _args: str) -> None:
+    """
+    !timezone                    show the server's zone (and yours, if different)
+    !timezone America/Vancouver  set the server's zone
+    !timezone me Europe/London   set just your own zone
+    """
+    logger.debug("function handle_timezone")
+    state = await get_state(message)
+    words = _args.split()
+    if len(words) == 0:
+        s = f"This server uses {state.zone.key}"
+        if (mine := state.zone_for(message.author.id)) != state.zone:
+            s += f", you use {mine.key}"
+        await message.reply(s)
+        return
+    user_id = None
+    if words[0].lower() == "me":
+        user_id = message.author.id
+        words = words[1:]
+    if len(words) != 1:
+        await message.reply("Give me one zone name like America/Toronto")
+        return
+    try:
+        zone = state.set_timezone(words[0], user_id)
+    except (ZoneInfoNotFoundError, ValueError):
+        await message.reply(f'I don\'t know the timezone "{words[0]}" (try something like America/Toronto)')
+        return
+    await message.reply(f"Your timezone is now {zone.key}" if user_id is not None else f"This server's timezone is now {zone.key}")
+
+
 async def handle_help(message: Message, _args: str) -> None:
     logger.debug("function handle_help")
-    if get_channel() is None:
-        await handle_setup(message, "")
+    await get_state(message)
     await message.reply("All commands: " + ", ".join(f"!{k}" for k in func_map.keys()))
 
 
+async def handle_metrics(message: Message, _args: str) -> None:
+    logger.debug("function handle_metrics")
+    if not is_admin(message):
+        await message.reply("Only admins can see metrics")
+        return
+    text = render()
+    if len(text) > 1900:  # discord message limit is 2000
+        text = text[:1900] + "\n..."
+    await message.reply(f"```\n{text}```")
+
+
+# "<@123> 7-9" or "<@!123> for 2 hours"
+ROSTER_LINE = re.compile(r"<@!?(\d+)>\s*(.+)")
+
+
+async def handle_roster(message: Message, _args: str) -> None:
+    """
+    Add a list of players at once, one per line (or separated by ";"):
+    !roster
+    @alice 7-9
+    @bob for 2 hours
+    """
+    logger.debug("function handle_roster")
+    state = await get_state(message)
+    if not is_admin(message):
+        await message.reply("Only admins can add a roster")
+        return
+    for user in getattr(message, "mentions", []):
+        remember_user(user)
+    now = message.created_at
+    entries: list[tuple[UserId, Availability]] = []
+    errors: list[str] = []
+    for line in filter(None, (line.strip() for line in re.split(r"[\n;]", _args))):
+        if (match := ROSTER_LINE.fullmatch(line)) is None:
+            errors.append(f'"{line}": start each line with an @mention')
+            continue
+        player = int(match[1])
+        zone = state.zone_for(player)
+        try:
+            with PARSE_SECONDS.time(), use_tz(zone):
+                entries.append((player, parse_availability(match[2], now=now.astimezone(zone))))
+        except TimeSyntaxError as e:
+            errors.append(f'"{line}": {e.message}')
+        except ValueError:
+            errors.append(f'"{line}": these numbers don\'t look right')
+    state.available_players.add_players(entries)
+    for player, tr in entries:
+        schedule_end_reminder(state, player, tr)
+    s = f"Added {len(entries)} player{"" if len(entries) == 1 else "s"}"
+    if errors:
+        s += "\nSkipped:\n" + "\n".join(errors)
+    await message.reply(s)
+    if entries:
+        await check_player_count(state)
+
+
+def pool_sizes() -> list[tuple[tuple[str, ...], float]]:
+    sizes: list[tuple[tuple[str, ...], float]] = []
+    for guild_id, state in g_guild_states.items():
+        players = state.available_players
+        sizes.append(((str(guild_id), "selected"), len(players.selected_players)))
+        sizes.append(((str(guild_id), "unselected"), len(players.unselected_players)))
+        sizes.append(((str(guild_id), "playing"), len(players.playing_players)))
+    return sizes
+
+
+POOL_PLAYERS.set_function(pool_sizes)
+
+
 func_map: OrderedDict[str, CommandHandler] = OrderedDict(
     {
         "help": handle_help,
@@ -346,5 +515,8 @@ func_map: OrderedDict[str, CommandHandler] = OrderedDict(
         "nodebug": disable_debug,
         "count": handle_count,
         "status": handle_status,
+        "timezone": handle_timezone,
+        "metrics": handle_metrics,
+        "roster": handle_roster,
     }
 )
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "info.json"
+TOKEN_ENV_VAR = "DISCORD_TOKEN"
+
+
+class ConfigError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Config:
+    token: str
+    log_level: str | None = None
+    metrics_port: int | None = None
+    # total shards across every process, and the ones this process runs
+    shard_count: int | None = None
+    shard_ids: list[int] | None = None
+    # where a sharding.py launcher collects per-shard load reports
+    coordinator_port: int | None = None
+    # zone for servers that haven't picked one with !timezone
+    timezone: str = "America/Toronto"
+    # register /slash versions of the commands
+    slash_commands: bool = False
+    # read "!" commands from messages; needs the privileged message content intent
+    prefix_commands: bool = True
+    # skip member chunking and caching, for very large servers
+    low_memory_members: bool = False
+    # also DM players when their game is set, starts or is cancelled
+    dm_notifications: bool = False
+    # remind players this many minutes before their game starts, and backups before their
+    # availability ends (null turns either off)
+    start_reminder_minutes: int | None = 10
+    end_reminder_minutes: int | None = 15
+
+
+def load_config(path: str | os.PathLike[str] | None = None) -> Config:
+    """
+    Read settings from a json file (info.json by default, or $BOT_CONFIG).
+    The token can come from $DISCORD_TOKEN instead of the file's "secret" key,
+    in which case the file is optional.
+    """
+    if path is None:
+        path = os.environ.get("BOT_CONFIG", DEFAULT_CONFIG_PATH)
+    path = Path(path)
+    info: dict = {}
+    if path.exists():
+        with path.open("r") as file:
+            info = json.load(file)
+    token = os.environ.get(TOKEN_ENV_VAR) or info.pop("secret", None)
+    info.pop("secret", None)
+    if token is None:
+        raise ConfigError(f"No token: set ${TOKEN_ENV_VAR} or put \"secret\" in {path}")
+    # the sharding launcher hands each process its shards through the environment
+    if "SHARD_COUNT" in os.environ:
+        info["shard_count"] = int(os.environ["SHARD_COUNT"])
+    if "SHARD_IDS" in os.environ:
+        info["shard_ids"] = [int(i) for i in os.environ["SHARD_IDS"].split(",")]
+    if "COORDINATOR_PORT" in os.environ:
+        info["coordinator_port"] = int(os.environ["COORDINATOR_PORT"])
+    if not info.get("slash_commands", False) and not info.get("prefix_commands", True):
+        raise ConfigError("Turning off prefix_commands without slash_commands would leave no way to use the bot")
+    known = {f.name for f in fields(Config)}
+    for key in info.keys() - known:
+        logger.warning("ignoring unknown config key %r in %s", key, path)
+    return Config(token=token, **{k: v for k, v in info.items() if k in known})
@@ -1,8 +1,36 @@
 import discord
 
 
-intents = discord.Intents.default()
-intents.members = True
-intents.message_content = True
+def make_intents(message_content: bool = True, members: bool = True) -> discord.Intents:
+    intents = discord.Intents.default()
+    intents.members = members
+    # only needed for "!" commands, slash commands arrive as interactions
+    intents.message_content = message_content
+    return intents
 
-client = discord.Client(intents=intents)
+
+intents = make_intents()
+
+client: discord.Client = discord.Client(intents=intents)
+
+
+def make_client(shard_count: int | None = None, shard_ids: list[int] | None = None,
+                message_content: bool = True, low_memory: bool = False) -> discord.Client:
+    """
+    Replace `client` with one built for this process.
+    With any sharding settings this is an AutoShardedClient, which runs all of
+    `shard_ids` (or every shard, if not given) over one connection per shard.
+
+    :param low_memory: don't download or cache guild member lists. Players are kept by id
+    and their names come from the messages they send, so nothing needs the member list.
+    """
+    global client, intents
+    intents = make_intents(message_content, members=not low_memory)
+    options = {}
+    if low_memory:
+        options = {"chunk_guilds_at_startup": False, "member_cache_flags": discord.MemberCacheFlags.none()}
+    if shard_count is None and shard_ids is None:
+        client = discord.Client(intents=intents, **options)
+    else:
+        client = discord.AutoShardedClient(intents=intents, shard_count=shard_count, shard_ids=shard_ids, **options)
+    return client
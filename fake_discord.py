@@ -0,0 +1,130 @@
+"""
+Stand-ins for the bits of discord.py the handlers touch, so commands can be
+driven without a gateway connection (tests, benchmarks, replays).
+"""
+import itertools
+from datetime import datetime, timezone
+
+import discord
+
+_ids = itertools.count(1_000_000)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int | None = None, name: str = "guild", shard_id: int = 0):
+        self.id: int = guild_id if guild_id is not None else next(_ids)
+        self.name: str = name
+        self.shard_id: int = shard_id
+
+    def __repr__(self) -> str:
+        return f"<FakeGuild {self.id}>"
+
+
+class FakeUser:
+    def __init__(self, name: str, user_id: int | None = None, admin: bool = False):
+        self.id: int = user_id if user_id is not None else next(_ids)
+        self.name: str = name
+        self.display_name: str = name
+        self.bot: bool = False
+        self.guild_permissions = discord.Permissions(administrator=admin)
+        self.dms: list[str] = []
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def send(self, content: str) -> "FakeMessage":
+        self.dms.append(content)
+        return FakeMessage(content, self, None)
+
+    def __eq__(self, other) -> bool:
+        return hasattr(other, "id") and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __repr__(self) -> str:
+        return f"<FakeUser {self.name}>"
+
+
+class FakeChannel(discord.TextChannel):
+    """
+    Subclasses TextChannel so `isinstance` checks in the handlers pass, but never calls
+    into discord.py's state machinery
+    """
+
+    def __init__(self, guild: FakeGuild, name: str = "general", channel_id: int | None = None):  # pyright: ignore[reportMissingSuperCall]
+        self.id = channel_id if channel_id is not None else next(_ids)
+        self.name = name
+        self.guild = guild  # pyright: ignore[reportAttributeAccessIssue]
+        self.sent: list[str] = []
+
+    async def send(self, content: str | None = None, **_kwargs) -> "FakeMessage":  # pyright: ignore[reportIncompatibleMethodOverride]
+        self.sent.append(content or "")
+        return FakeMessage(content or "", None, self)
+
+    def __repr__(self) -> str:
+        return f"<FakeChannel {self.name}>"
+
+
+class FakeMessage:
+    def __init__(self, content: str, author: FakeUser | None, channel: FakeChannel | None,
+                 created_at: datetime | None = None):
+        self.id: int = next(_ids)
+        self.content: str = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild if channel is not None else None
+        self.created_at: datetime = created_at if created_at is not None else datetime.now(timezone.utc)
+        self.reactions: list[str] = []
+        self.replies: list[str] = []
+
+    async def reply(self, content: str, **_kwargs) -> "FakeMessage":
+        self.replies.append(content)
+        if self.channel is not None:
+            return await self.channel.send(content)
+        return FakeMessage(content, None, None)
+
+    async def add_reaction(self, emoji: str) -> None:
+        self.reactions.append(emoji)
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.deferred: bool = False
+        self.done: bool = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, **_kwargs) -> None:
+        self.deferred = self.done = True
+
+    async def send_message(self, content: str, **_kwargs) -> None:
+        self.done = True
+        self.interaction.sent.append(content)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content: str, **_kwargs) -> FakeMessage:
+        self.interaction.sent.append(content)
+        return FakeMessage(content, None, self.interaction.channel)
+
+
+class FakeInteraction:
+    def __init__(self, user: FakeUser, channel: FakeChannel, created_at: datetime | None = None):
+        self.id: int = next(_ids)
+        self.user = user
+        self.channel = channel
+        self.guild = channel.guild
+        self.created_at: datetime = created_at if created_at is not None else datetime.now(timezone.utc)
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent: list[str] = []
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from players import AvailablePlayers, DEFAULT_PLAYERS_NEEDED
+from utils import find_zone, get_tz
+
+if TYPE_CHECKING:
+    from zoneinfo import ZoneInfo
+    from discord import TextChannel
+
+# discord's default when sharding isn't configured
+g_shard_count: int = 1
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """
+    The shard discord delivers a guild's events on
+    (https://discord.com/developers/docs/topics/gateway#sharding)
+    """
+    return (guild_id >> 22) % shard_count
+
+
+class GuildState:
+    """
+    Everything the bot remembers about one server
+    """
+
+    def __init__(self, guild_id: int, players_needed: int = DEFAULT_PLAYERS_NEEDED):
+        self.guild_id: int = guild_id
+        self.shard_id: int = shard_for_guild(guild_id, g_shard_count)
+        self.channel: TextChannel | None = None
+        self.debug_mode: bool = False
+        self.confirmed_start_time: datetime | None = None
+        self.waiting: bool = False
+        self.available_players: AvailablePlayers = AvailablePlayers(players_needed)
+        # None means the bot's default zone
+        self.timezone: ZoneInfo | None = None
+        # user id : zone, for players who aren't where the rest of the server is
+        self.user_timezones: dict[int, ZoneInfo] = {}
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return self.timezone or get_tz()
+
+    def zone_for(self, user_id: int) -> ZoneInfo:
+        return self.user_timezones.get(user_id) or self.zone
+
+    def set_timezone(self, key: str, user_id: int | None = None) -> ZoneInfo:
+        """
+        :raises zoneinfo.ZoneInfoNotFoundError: if `key` isn't a zone name
+        """
+        zone = find_zone(key)
+        if user_id is None:
+            self.timezone = zone
+        else:
+            self.user_timezones[user_id] = zone
+        return zone
+
+    @property
+    def players_needed(self) -> int:
+        return self.available_players.players_needed
+
+    @players_needed.setter
+    def players_needed(self, n: int) -> None:
+        self.available_players.players_needed = n
+
+    def __repr__(self) -> str:
+        return f"<GuildState {self.guild_id} shard={self.shard_id} players={self.available_players.items()}>"
+
+
+# guild id : state. Each process only ever sees the guilds on its own shards,
+# so there is nothing shared between processes to lock
+g_guild_states: dict[int, GuildState] = {}
+
+
+def get_guild_state(guild_id: int) -> GuildState:
+    state = g_guild_states.get(guild_id)
+    if state is None:
+        state = g_guild_states[guild_id] = GuildState(guild_id)
+    return state
+
+
+def guild_states_by_shard() -> dict[int, list[GuildState]]:
+    by_shard: dict[int, list[GuildState]] = {}
+    for state in g_guild_states.values():
+        by_shard.setdefault(state.shard_id, []).append(state)
+    return by_shard
+
+
+def set_shard_count(shard_count: int) -> None:
+    global g_shard_count
+    g_shard_count = shard_count
+    for state in g_guild_states.values():
+        state.shard_id = shard_for_guild(state.guild_id, shard_count)
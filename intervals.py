@@ -0,0 +1,152 @@
+"""
+Availability made of several windows, e.g. "7-9 and 10-12".
+
+An IntervalSet has the same interface as TimeRange (start/end, time_in_range, str) so the
+rest of the bot can hold either. Code that only ever sees TimeRanges takes the old path.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import override
+
+from times import TimeRange
+from utils import TimeSyntaxError, fmt_dt
+
+Interval = tuple[datetime, datetime]
+
+# "7-9, 10-12", "7-9 and 10-12", "7-9 & 10-12"
+SEPARATORS = re.compile(r"\s*(?:,|&|\band\b)\s*")
+
+
+class IntervalSet:
+    """
+    Sorted, merged, non-overlapping [start, end] intervals, kept as two parallel lists so
+    lookups can bisect on either end
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self.starts: list[datetime] = []
+        self.ends: list[datetime] = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:  # touches or overlaps the last one
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @staticmethod
+    def from_ranges(ranges: Iterable["TimeRange | IntervalSet"]) -> "IntervalSet":
+        return IntervalSet(i for r in ranges for i in intervals_of(r))
+
+    def intervals(self) -> list[Interval]:
+        return list(zip(self.starts, self.ends))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    @override
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.starts == other.starts and self.ends == other.ends
+
+    # the TimeRange interface
+
+    @property
+    def start_time_available(self) -> datetime:
+        return self.starts[0]
+
+    @property
+    def duration_available(self) -> timedelta:
+        return self.ends[-1] - self.starts[0]
+
+    def get_end_time_available(self) -> datetime:
+        return self.ends[-1]
+
+    def time_in_range(self, t: datetime) -> bool:
+        i = bisect_right(self.starts, t) - 1
+        return i >= 0 and t <= self.ends[i]
+
+    contains = time_in_range
+
+    @override
+    def __str__(self) -> str:
+        return "available " + ", ".join(f"from {fmt_dt(s)} to {fmt_dt(e)}" for s, e in self.intervals())
+
+    @override
+    def __repr__(self) -> str:
+        return str(self)
+
+    # set operations
+
+    def union(self, other: "TimeRange | IntervalSet") -> "IntervalSet":
+        result = IntervalSet()
+        result.starts, result.ends = list(self.starts), list(self.ends)
+        for start, end in intervals_of(other):
+            # everything from the first interval ending at/after `start` to the last one starting at/before `end` merges
+            lo = bisect_left(result.ends, start)
+            hi = bisect_right(result.starts, end)
+            if lo < hi:
+                start = min(start, result.starts[lo])
+                end = max(end, result.ends[hi - 1])
+            result.starts[lo:hi] = [start]
+            result.ends[lo:hi] = [end]
+        return result
+
+    def intersection(self, other: "TimeRange | IntervalSet") -> "IntervalSet":
+        out: list[Interval] = []
+        for start, end in intervals_of(other):
+            lo = bisect_left(self.ends, start)
+            hi = bisect_right(self.starts, end)
+            for i in range(lo, hi):
+                s, e = max(start, self.starts[i]), min(end, self.ends[i])
+                if s <= e:
+                    out.append((s, e))
+        result = IntervalSet()
+        result.starts = [s for s, _ in out]
+        result.ends = [e for _, e in out]
+        return result
+
+    def trim_before(self, t: datetime) -> None:
+        """
+        Forget intervals that finished before `t`
+        """
+        i = bisect_left(self.ends, t)
+        del self.starts[:i]
+        del self.ends[:i]
+
+
+def intervals_of(r: "TimeRange | IntervalSet") -> list[Interval]:
+    if isinstance(r, IntervalSet):
+        return r.intervals()
+    return [(r.start_time_available, r.get_end_time_available())]
+
+
+def parse_availability(string: str, now: datetime | None = None) -> "TimeRange | IntervalSet":
+    """
+    A TimeRange, or an IntervalSet when the string lists several ranges ("7-9 and 10-12")
+    """
+    parts = [p for p in SEPARATORS.split(string.strip()) if p]
+    if len(parts) <= 1:
+        return TimeRange(string, now=now)
+    if len(parts) > 20:
+        raise TimeSyntaxError("that's too many time ranges")
+    return IntervalSet.from_ranges(TimeRange(p, now=now) for p in parts)
+
+
+def get_common_start_time(ranges: list["TimeRange | IntervalSet"]) -> datetime | None:
+    """
+    `TimeRange.get_common_start_time` that also understands IntervalSets
+    """
+    if all(type(r) is TimeRange for r in ranges):
+        return TimeRange.get_common_start_time(ranges)  # pyright: ignore[reportArgumentType]
+    common = IntervalSet(intervals_of(ranges[0]))
+    for r in ranges[1:]:
+        common = common.intersection(r)
+        if not common:
+            return None
+    return common.start_time_available
@@ -0,0 +1,144 @@
+"""
+Packing the pool into as many games as people's times allow.
+
+A lobby is `size` players who are all free at its start time. `pack` sweeps availability
+windows in order of start time with a heap of the players currently free, ordered by when
+they stop being free, and whenever `size` of them are free it seats the ones who leave
+soonest. Taking the soonest to leave is the classic earliest-deadline choice: anyone who
+leaves later can do anything they could, so for single windows it forms the most lobbies.
+
+`Lobbies` keeps the assignment stable as people come and go: newcomers only get packed
+with the people still waiting, and when someone leaves a lobby a waiting player who is free
+at its start takes their place before the lobby is broken up.
+"""
+from __future__ import annotations
+from collections.abc import Iterable
+from datetime import datetime
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING
+
+from intervals import intervals_of
+
+if TYPE_CHECKING:
+    from players import Availability, UserId
+
+
+class Lobby:
+    def __init__(self, start: datetime, players: list[UserId]):
+        self.start: datetime = start
+        self.players: list[UserId] = players
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __repr__(self) -> str:
+        return f"<Lobby {self.start} {self.players}>"
+
+
+def pack(ranges: dict[UserId, Availability], size: int) -> tuple[list[Lobby], list[UserId]]:
+    """
+    :return: the lobbies, in order of start time, and everyone who didn't fit in one
+    """
+    if size <= 0:
+        return [], list(ranges)
+    events = sorted((start, end, u) for u, r in ranges.items() for start, end in intervals_of(r))
+    seated: set[UserId] = set()
+    lobbies: list[Lobby] = []
+    # (end of window, user id). Entries go stale when their window ends or the player gets
+    # seated through another window; they're dropped when they come up.
+    free: list[tuple[datetime, UserId]] = []
+    for start, end, u in events:
+        if u in seated:
+            continue
+        heappush(free, (end, u))
+        if len(free) < size:
+            continue
+        taken: list[tuple[datetime, UserId]] = []
+        while free and len(taken) < size:
+            entry = heappop(free)
+            if entry[0] < start or entry[1] in seated or any(entry[1] == t[1] for t in taken):
+                continue
+            taken.append(entry)
+        if len(taken) == size:
+            players = [t[1] for t in taken]
+            seated.update(players)
+            lobbies.append(Lobby(start, players))
+        else:
+            for entry in taken:
+                heappush(free, entry)
+    return lobbies, [u for u in ranges if u not in seated]
+
+
+class Lobbies:
+    """
+    Lobby assignments for one pool, updated as players are added and removed
+    """
+
+    def __init__(self, size: int):
+        self.size: int = size
+        self.lobbies: list[Lobby] = []
+        # everyone, seated or not
+        self.ranges: dict[UserId, Availability] = {}
+        self.lobby_of: dict[UserId, Lobby] = {}
+
+    def waiting(self) -> list[UserId]:
+        return [u for u in self.ranges if u not in self.lobby_of]
+
+    def add(self, player: UserId, availability: Availability) -> None:
+        """
+        Add a player, or change the times of one already here
+        """
+        if player in self.ranges:
+            self.remove(player)
+        self.ranges[player] = availability
+        self._fill()
+
+    def add_many(self, players: Iterable[tuple[UserId, Availability]]) -> None:
+        for player, availability in players:
+            self.remove(player)
+            self.ranges[player] = availability
+        self._fill()
+
+    def remove(self, player: UserId) -> None:
+        if self.ranges.pop(player, None) is None:
+            return
+        lobby = self._unseat(player)
+        if lobby is None:
+            return
+        for u in self.waiting():
+            if self.ranges[u].time_in_range(lobby.start):
+                lobby.players.append(u)
+                self.lobby_of[u] = lobby
+                return
+        # nobody can fill in, so give everyone else in it another chance at a lobby
+        for u in lobby.players:
+            del self.lobby_of[u]
+        self.lobbies.remove(lobby)
+        self._fill()
+
+    def resize(self, size: int) -> None:
+        if size != self.size:
+            self.size = size
+            self.repack()
+
+    def repack(self) -> None:
+        """
+        Forget the current lobbies and pack everyone again
+        """
+        self.lobbies.clear()
+        self.lobby_of.clear()
+        self._fill()
+
+    def _unseat(self, player: UserId) -> Lobby | None:
+        lobby = self.lobby_of.pop(player, None)
+        if lobby is not None:
+            lobby.players.remove(player)
+        return lobby
+
+    def _fill(self) -> None:
+        lobbies, _rest = pack({u: self.ranges[u] for u in self.waiting()}, self.size)
+        for lobby in lobbies:
+            for u in lobby.players:
+                self.lobby_of[u] = lobby
+        self.lobbies.extend(lobbies)
+        self.lobbies.sort(key=lambda lobby: lobby.start)
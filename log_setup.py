@@ -0,0 +1,45 @@
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s %(levelname)s:%(name)s:%(message)s"
+
+
+def get_log_level(configured: str | int | None = None) -> int:
+    """
+    LOG_LEVEL in the environment wins, then the configured value, then INFO
+    """
+    level = os.environ.get("LOG_LEVEL", configured)
+    if level is None:
+        return logging.INFO
+    if isinstance(level, int):
+        return level
+    if level.isnumeric():
+        return int(level)
+    resolved = logging.getLevelName(level.upper())
+    if not isinstance(resolved, int):
+        raise ValueError(f"Unknown log level {level!r}")
+    return resolved
+
+
+def setup_logging(level: int = logging.INFO, handler: logging.Handler | None = None) -> QueueListener:
+    """
+    Route every log record through a queue so the actual I/O happens on the listener's
+    thread instead of the event loop. Call `.stop()` on the result to flush on exit.
+
+    :param level: root log level, records below it are dropped before any formatting
+    :param handler: where records end up, stderr by default
+    """
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    return listener
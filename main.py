@@ -1,19 +1,35 @@
 #!/bin/env python3
+import asyncio
+import re
 import discord
+from discord import app_commands
 from command_handlers import CommandHandler, func_map, G_PREFIX
-import json
-from discord_globals import client
+from config import Config, load_config
+import discord_globals
+from guild_state import get_guild_state, set_shard_count
+from utils import set_default_tz, use_tz
+from metrics import COMMANDS_TOTAL, DISPATCH_SECONDS, start_metrics_server
+from notifier import Notifier, set_notifier
+from scheduler import configure_reminders, g_scheduler
+from sharding import report_load
+from slash_commands import build_command_tree
+import time
 
-file = open("info.json", "r")
-SECRET_TOKEN = json.load(file)["secret"]
-file.close()
+g_config: Config | None = None
+g_metrics_server = None
+g_load_reporter: asyncio.Task | None = None
+g_command_tree: app_commands.CommandTree | None = None
+g_synced_commands: bool = False
 
 import logging
+from log_setup import setup_logging, get_log_level
 logger = logging.getLogger(__name__)
 
 async def parse_command(message: discord.Message):
+    received = time.perf_counter()
     message.content = message.content.lower()
-    command: str = message.content.removeprefix(G_PREFIX).split(" ")[0]
+    # up to the first space or newline, so multi-line commands like !roster work
+    command: str = re.match(r"\S*", message.content.removeprefix(G_PREFIX))[0]  # pyright: ignore[reportOptionalSubscript]
     args: str = message.content.removeprefix(G_PREFIX).removeprefix(command).strip()
     if len(command) == 0 or "!" in command:
         # this is when someone sends a exclamation mark or !!!!
@@ -25,7 +41,8 @@ async def parse_command(message: discord.Message):
         )
         matched_commands = [keys[i] for i in range(len(is_match)) if is_match[i]]
         if (count := is_match.count(True)) == 1:  # found command!
-            f = func_map.get(matched_commands[0])
+            command = matched_commands[0]
+            f = func_map.get(command)
         elif count > 1:
             return await message.channel.send(
                 f'Ambiguous command: "{command}" ({", ".join(matched_commands)})'
@@ -34,31 +51,63 @@ async def parse_command(message: discord.Message):
             return await message.channel.send(f"huh? what does that mean?")
     if f is None:
         raise TypeError("")
+    COMMANDS_TOTAL.inc(command)
+    DISPATCH_SECONDS.observe(time.perf_counter() - received)
     _ = await f(message, args)  # call the handle command function
 
 
-@client.event
 async def on_ready():
-    logging.error(f"We have logged in as {client.user}")
+    global g_metrics_server, g_load_reporter, g_synced_commands
+    client = discord_globals.client
+    logger.warning("We have logged in as %s (shards %s)", client.user, getattr(client, "shard_ids", None) or client.shard_id)
+    g_scheduler.start()
+    if g_config is None:
+        return
+    if g_config.metrics_port is not None and g_metrics_server is None:
+        g_metrics_server = await start_metrics_server(g_config.metrics_port)
+    if g_config.coordinator_port is not None and g_load_reporter is None:
+        g_load_reporter = asyncio.create_task(report_load(g_config.coordinator_port, client))
+    if g_command_tree is not None and not g_synced_commands:
+        synced = await g_command_tree.sync()
+        g_synced_commands = True
+        logger.info("synced %d slash commands", len(synced))
 
 
-@client.event
 async def on_message(message: discord.Message):
-    if message.author == client.user:  # skip if I sent this message
+    if message.author == discord_globals.client.user:  # skip if I sent this message
+        return
+    if message.guild is None:  # no DMs, everything is per server
         return
     if message.content.startswith(G_PREFIX):
         try:
-            await parse_command(message)
-        except BaseException as e:
-            logger.exception(f"failed to parse command", e)
+            with use_tz(get_guild_state(message.guild.id).zone):
+                await parse_command(message)
+        except BaseException:
+            logger.exception("failed to parse command")
             await message.reply("failed to parse command due to internal error. sorry.")
 
 
 def main():
-    logging.basicConfig(level=logging.DEBUG)
+    global g_config, g_command_tree
+    g_config = load_config()
+    listener = setup_logging(get_log_level(g_config.log_level))
     logger.info("====================  starting  ==================== ")
-    client.run(SECRET_TOKEN)
+    client = discord_globals.make_client(
+        g_config.shard_count, g_config.shard_ids, g_config.prefix_commands, g_config.low_memory_members
+    )
+    set_shard_count(g_config.shard_count or 1)
+    set_default_tz(g_config.timezone)
+    if g_config.dm_notifications:
+        set_notifier(Notifier())
+    configure_reminders(g_config.start_reminder_minutes, g_config.end_reminder_minutes)
+    client.event(on_ready)
+    if g_config.prefix_commands:
+        client.event(on_message)
+    if g_config.slash_commands:
+        g_command_tree = build_command_tree(client)
+    client.run(g_config.token, log_handler=None)
     logger.warning("exiting")
+    listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,33 +1,41 @@
-
-from discord import TextChannel, Message
+from __future__ import annotations
 import logging
+from typing import TYPE_CHECKING
 
-from globals import g_debug_mode, g_channel
-
-logger = logging.getLogger(__name__)
+from metrics import SEND_SECONDS
 
+if TYPE_CHECKING:
+    from discord import Message
+    from guild_state import GuildState
 
-async def debug_log(msg) -> None:
-    logger.debug(msg)
-    if g_debug_mode:
-        await send(msg)
-
-def get_channel() -> TextChannel | None:
-    return g_channel
+logger = logging.getLogger(__name__)
 
 
-def set_channel(c: TextChannel) -> None:
-    global g_channel
-    g_channel = c
+async def debug_log(state: GuildState, msg: str, *args) -> None:
+    """
+    Log at DEBUG and echo to the channel in debug mode.
+    Takes %-style args so nothing is formatted when neither is on.
+    """
+    if not state.debug_mode:
+        logger.debug(msg, *args)
+        return
+    text = msg % args if args else msg
+    logger.debug(text)
+    await send(state, text)
 
 
+def is_admin(message: Message) -> bool:
+    # only guild members have permissions, DMs come from plain users
+    permissions = getattr(message.author, "guild_permissions", None)
+    return permissions is not None and permissions.administrator
 
 
-async def send(message: str) -> Message | None:
-    logger.info(f"sending message: {message}")
-    channel = get_channel()
+async def send(state: GuildState, message: str) -> Message | None:
+    logger.info("sending message: %s", message)
+    channel = state.channel
     if channel is not None:
-        return await channel.send(message)
+        with SEND_SECONDS.time():
+            return await channel.send(message)
     else:
-        logger.warning(f"not sending message because {channel=}")
+        logger.warning("not sending message because channel=%r", channel)
         return None
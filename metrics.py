@@ -0,0 +1,171 @@
+"""
+Tiny prometheus-style metrics.
+
+Recording a value is a dict lookup and an add, so it is fine to leave on all the time.
+All text formatting happens in `render()`, which only runs when someone scrapes.
+"""
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+Labels = tuple[str, ...]
+Sample = tuple[str, Labels, float]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Metric:
+    kind: str = "untyped"
+
+    def __init__(self, name: str, doc: str, labelnames: Labels = ()):
+        self.name: str = name
+        self.doc: str = doc
+        self.labelnames: Labels = labelnames
+        g_registry.append(self)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str, labelnames: Labels = ()):
+        super().__init__(name, doc, labelnames)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self.values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, v in self.values.items():
+            yield self.name, labels, v
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, labelnames: Labels = ()):
+        super().__init__(name, doc, labelnames)
+        self.values: dict[Labels, float] = {}
+        self.function: Callable[[], Iterable[tuple[Labels, float]]] | None = None
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = value
+
+    def set_function(self, f: Callable[[], Iterable[tuple[Labels, float]]]) -> None:
+        """
+        Compute the gauge at scrape time instead of on every change
+        :param f: returns (labels, value) pairs
+        """
+        self.function = f
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, v in self.values.items():
+            yield self.name, labels, v
+        if self.function is not None:
+            for labels, v in self.function():
+                yield self.name, labels, v
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: Labels = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.buckets: tuple[float, ...] = buckets
+        # per label set: non-cumulative bucket counts (last slot is +Inf), cumulated on render
+        self.counts: dict[Labels, list[int]] = {}
+        self.sums: dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        return sum(self.counts.get(labels, ()))
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, counts in self.counts.items():
+            total = 0
+            for le, c in zip((*map(str, self.buckets), "+Inf"), counts):
+                total += c
+                yield f"{self.name}_bucket", (*labels, le), total
+            yield f"{self.name}_sum", labels, self.sums[labels]
+            yield f"{self.name}_count", labels, total
+
+
+g_registry: list[Metric] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Labels, values: Labels) -> str:
+    if len(values) == 0:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+def render() -> str:
+    """
+    :return: every registered metric in the prometheus text exposition format
+    """
+    lines: list[str] = []
+    for m in g_registry:
+        lines.append(f"# HELP {m.name} {m.doc}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        names = (*m.labelnames, "le") if isinstance(m, Histogram) else m.labelnames
+        for sample_name, labels, value in m.samples():
+            label_names = names if sample_name.endswith("_bucket") else m.labelnames
+            lines.append(f"{sample_name}{_fmt_labels(label_names, labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """
+    Serve `render()` on http://host:port/metrics, on the bot's event loop
+    """
+    from aiohttp import web  # only needed when the endpoint is turned on
+
+    async def handle_metrics(_request: web.Request) -> web.Response:
+        return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("serving metrics on http://%s:%d/metrics", host, port)
+    return runner
+
+
+COMMANDS_TOTAL = Counter("bot_commands_total", "Commands handled", ("command",))
+PARSE_SECONDS = Histogram("bot_time_parse_seconds", "Time spent parsing availability strings")
+DISPATCH_SECONDS = Histogram("bot_dispatch_seconds", "Time from receiving a command to calling its handler")
+SEND_SECONDS = Histogram("bot_discord_send_seconds", "Latency of sending a message to discord")
+POOL_PLAYERS = Gauge("bot_pool_players", "Players in each pool", ("guild", "pool"))
+PRUNED_TOTAL = Counter("bot_pruned_players_total", "Players removed from a pool by pruning", ("reason",))
+DMS_TOTAL = Counter("bot_dms_total", "Direct-message notifications by outcome", ("result",))
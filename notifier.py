@@ -0,0 +1,132 @@
+"""
+Optional direct messages to players, for people who don't watch the channel.
+
+Sends go out concurrently, at most `concurrency` at a time, with retries and backoff on
+discord errors that are worth retrying. Each (user, event) is sent once, and everything a
+user is sent within `window` seconds goes out as one message, so a lobby starting right
+after its time was agreed costs one DM per player instead of two.
+"""
+import asyncio
+import logging
+import random
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+import discord
+
+import discord_globals
+from metrics import DMS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY: int = 10
+DEFAULT_WINDOW: float = 2.0
+DEFAULT_RETRIES: int = 3
+DEFAULT_BACKOFF: float = 1.0
+# how many (user, event) keys to remember for deduplication
+SENT_KEYS_SIZE: int = 4096
+
+
+async def fetch_user(user_id: int) -> Any:
+    """
+    The user from discord.py's cache, or from the API when members aren't cached
+    """
+    return discord_globals.client.get_user(user_id) or await discord_globals.client.fetch_user(user_id)
+
+
+class Notifier:
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        window: float = DEFAULT_WINDOW,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        get_user: Callable[[int], Awaitable[Any]] = fetch_user,
+    ):
+        """
+        :param get_user: user id -> anything with an async `send(text)`
+        """
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self.window: float = window
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.get_user: Callable[[int], Awaitable[Any]] = get_user
+        # user id : lines waiting for the window to close
+        self.pending: dict[int, list[str]] = {}
+        self.sent_keys: OrderedDict[tuple[int, Hashable], None] = OrderedDict()
+        self.tasks: set[asyncio.Task] = set()
+
+    def notify(self, user_ids: Iterable[int], text: str, key: Hashable) -> None:
+        """
+        Queue `text` for each user. `key` names the event (e.g. ("start", guild id, start time));
+        a user is only ever sent one message per key.
+        """
+        for user_id in user_ids:
+            if (user_id, key) in self.sent_keys:
+                DMS_TOTAL.inc("duplicate")
+                continue
+            self.sent_keys[(user_id, key)] = None
+            if len(self.sent_keys) > SENT_KEYS_SIZE:
+                self.sent_keys.popitem(last=False)
+            lines = self.pending.get(user_id)
+            if lines is not None:
+                lines.append(text)
+                DMS_TOTAL.inc("consolidated")
+                continue
+            self.pending[user_id] = [text]
+            task = asyncio.create_task(self._flush(user_id))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def drain(self) -> None:
+        """
+        Wait for everything queued so far to be sent (or given up on)
+        """
+        while self.tasks:
+            await asyncio.gather(*self.tasks)
+
+    async def _flush(self, user_id: int) -> None:
+        if self.window > 0:
+            await asyncio.sleep(self.window)
+        text = "\n".join(self.pending.pop(user_id))
+        async with self.semaphore:
+            await self._send(user_id, text)
+
+    async def _send(self, user_id: int, text: str) -> bool:
+        for attempt in range(self.retries + 1):
+            try:
+                user = await self.get_user(user_id)
+                await user.send(text)
+                DMS_TOTAL.inc("sent")
+                return True
+            except (discord.Forbidden, discord.NotFound):
+                logger.info("can't DM user %d, they have DMs closed or left", user_id)
+                break
+            except discord.HTTPException as e:
+                if e.status < 500 and e.status != 429:
+                    logger.warning("DM to user %d failed: %s", user_id, e)
+                    break
+                error: Exception = e
+            except (OSError, asyncio.TimeoutError) as e:
+                error = e
+            if attempt < self.retries:
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                logger.info("DM to user %d failed (%s), retrying in %.1fs", user_id, error, delay)
+                await asyncio.sleep(delay)
+        DMS_TOTAL.inc("failed")
+        return False
+
+
+# None when DMs are turned off in the config
+g_notifier: Notifier | None = None
+
+
+def set_notifier(notifier: Notifier | None) -> None:
+    global g_notifier
+    g_notifier = notifier
+
+
+def notify(user_ids: Iterable[int], text: str, key: Hashable) -> None:
+    if g_notifier is not None:
+        g_notifier.notify(user_ids, text, key)
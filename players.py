@@ -1,43 +1,71 @@
 from collections import OrderedDict
-from copy import copy
-from discord.abc import User
+from collections.abc import Iterable
 
 from datetime import datetime, timedelta
 import logging
-from message_utils import debug_log
 from times import TimeRange
-from utils import fmt_dt, get_now_rounded
-from globals import g_players_needed
+from intervals import IntervalSet
+from lobbies import Lobbies, Lobby
+from utils import get_now_rounded
+from metrics import PRUNED_TOTAL
+from slots import SlotCounter, SlotWindow
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PLAYERS_NEEDED: int = 5
+# players are kept by discord user id, see user_cache for their names
+UserId = int
+# one window, or several for players who said something like "7-9 and 10-12"
+Availability = TimeRange | IntervalSet
+# ("add", user id, availability) or ("remove", user id)
+BatchEvent = tuple[str, UserId, Availability] | tuple[str, UserId]
+
+
 class AvailablePlayers:
-    # name : (times available)
-    unselected_players: OrderedDict[User, TimeRange]
-    selected_players: OrderedDict[User, TimeRange]
-    # name : (times available, when game started)
-    playing_players: dict[User, tuple[TimeRange, datetime]]
+    # user id : (times available)
+    unselected_players: OrderedDict[UserId, Availability]
+    selected_players: OrderedDict[UserId, Availability]
+    # user id : (times available, when game started)
+    playing_players: dict[UserId, tuple[Availability, datetime]]
 
-    def __init__(self):
+    def __init__(self, players_needed: int = DEFAULT_PLAYERS_NEEDED):
         self.unselected_players = OrderedDict()
         self.selected_players = OrderedDict()
         self.playing_players = {}
+        # everyone not playing, packed into as many games as their times allow
+        self.lobbies: Lobbies = Lobbies(players_needed)
+        # user id : (the TimeRange it was made from, bitmap), for windows starting at _bitmap_key
+        self._bitmaps: dict[UserId, tuple[Availability, int]] = {}
+        self._bitmap_key: tuple[datetime, timedelta] | None = None
 
     def start_game(self):
         """
         Move selected players to playing
         """
         self.playing_players = {u: (tr, datetime.now()) for (u, tr) in self.selected_players.items()}
+        for u in self.selected_players:
+            self.lobbies.remove(u)
         self.selected_players.clear()
 
-    def items(self) -> list[tuple[User, tuple[TimeRange, bool]]]:
+    @property
+    def players_needed(self) -> int:
+        return self.lobbies.size
+
+    @players_needed.setter
+    def players_needed(self, n: int) -> None:
+        self.lobbies.resize(n)
+
+    def lobby_assignments(self) -> list[Lobby]:
+        return self.lobbies.lobbies
+
+    def items(self) -> list[tuple[UserId, tuple[Availability, bool]]]:
         return [(u, (tr, sel)) for (u, tr, sel)
                 in [(u, tr, True) for u, tr in self.selected_players.items()] + [(u, tr, False) for u, tr in self.unselected_players.items()]]
 
-    def values(self) -> list[tuple[TimeRange, bool]]:
+    def values(self) -> list[tuple[Availability, bool]]:
         return [(tr, sel) for (_, (tr, sel)) in self.items()]
 
-    def keys(self) -> list[User]:
+    def keys(self) -> list[UserId]:
         return [u for (u, _) in self.items()]
 
     def __len__(self) -> int:
@@ -46,31 +74,92 @@ class AvailablePlayers:
         """
         return len(self.not_playing())
 
-    def not_playing(self) -> list[User]:
+    def not_playing(self) -> list[UserId]:
         return [*self.unselected_players.keys(), *self.selected_players.keys()]
 
-    def add_player(self, player: User, timerange: TimeRange):
-        if self.has_enough_players():
+    def add_player(self, player: UserId, timerange: Availability):
+        self._add(player, timerange)
+        self.lobbies.add(player, timerange)
+
+    def add_players(self, players: Iterable[tuple[UserId, Availability]]) -> None:
+        """
+        `add_player` for many players, packing lobbies once at the end
+        """
+        players = list(players)
+        for player, timerange in players:
+            self._add(player, timerange)
+        self.lobbies.add_many(players)
+
+    def apply_batch(self, events: Iterable[BatchEvent]) -> None:
+        """
+        Apply adds and removes in order, then update lobbies once for everyone who changed
+        """
+        changed: dict[UserId, Availability | None] = {}
+        for event in events:
+            match event:
+                case ("add", player, timerange):
+                    self._add(player, timerange)
+                    changed[player] = timerange
+                case ("remove", player):
+                    self._remove(player)
+                    changed[player] = None
+                case _:
+                    raise ValueError(f"unknown batch event {event!r}")
+        for player, timerange in changed.items():
+            if timerange is None:
+                self.lobbies.remove(player)
+        self.lobbies.add_many((p, tr) for p, tr in changed.items() if tr is not None)
+
+    def _add(self, player: UserId, timerange: Availability):
+        if player in self.selected_players:  # new times for someone already here
+            self.selected_players[player] = timerange
+        elif player in self.unselected_players:
+            self.unselected_players[player] = timerange
+        elif self.has_enough_players():
             self.unselected_players[player] = timerange
         else:
             self.selected_players[player] = timerange
 
-    def user_is_selected(self, player: User) -> bool:
+    def slot_bitmaps(self, window: SlotWindow, only_selected: bool = False) -> dict[UserId, int]:
+        """
+        Each player's availability as a bitmap over `window` (see slots.py).
+        Bitmaps are kept until the player's TimeRange or the window changes.
+        """
+        if self._bitmap_key != (key := (window.origin, window.slot_length)):
+            self._bitmaps.clear()
+            self._bitmap_key = key
+        out: dict[UserId, int] = {}
+        for u, (tr, sel) in self.items():
+            if only_selected and not sel:
+                continue
+            cached = self._bitmaps.get(u)
+            if cached is None or cached[0] is not tr:
+                cached = self._bitmaps[u] = (tr, window.bitmap(tr))
+            out[u] = cached[1]
+        return out
+
+    def headcount(self, window: SlotWindow) -> SlotCounter:
+        """
+        How many players are free in each slot of `window`
+        """
+        return SlotCounter(self.slot_bitmaps(window).values())
+
+    def user_is_selected(self, player: UserId) -> bool:
         return player in self.selected_players
 
     def has_enough_players(self) -> bool:
-        return len(self.selected_players) >= g_players_needed
+        return len(self.selected_players) >= self.players_needed
 
-    def select_player(self, player: User):
+    def select_player(self, player: UserId):
         if player not in self.unselected_players:
-            logger.error(f"can't select player: {player} because they aren't unselected")
+            logger.error("can't select player: %s because they aren't unselected", player)
             return
         self.selected_players[player] = self.unselected_players[player]
         del self.unselected_players[player]
 
-    def deselect_player(self, player: User):
+    def deselect_player(self, player: UserId):
         if player not in self.selected_players:
-            logger.error(f"can't deselect player: {player} because they aren't selected")
+            logger.error("can't deselect player: %s because they aren't selected", player)
             return
         self.unselected_players[player] = self.selected_players[player]
         del self.selected_players[player]
@@ -84,41 +173,50 @@ class AvailablePlayers:
         self.deselect_all_players()
         unselected = list(enumerate(self.unselected_players))
         for ( i, m ) in unselected:
-            if i >= g_players_needed:
+            if i >= self.players_needed:
                 break
             self.select_player(m)
 
-    def delete(self, player: User):
+    def delete(self, player: UserId):
         """
         Remove from all dictionaries
         """
+        self.lobbies.remove(player)
+        self._remove(player)
+
+    def _remove(self, player: UserId):
+        self._bitmaps.pop(player, None)
         self.playing_players.pop(player, None)
         self.unselected_players.pop(player, None)
         self.selected_players.pop(player, None)
 
-    async def prune(self):
+    def prune(self) -> list[tuple[UserId, Availability]]:
+        """
+        Put players whose game is over back in the pool and drop everyone whose time has run out
+        :return: the dropped players
+        """
         game_length = timedelta(minutes=25)
-        players_in_game = copy(self.playing_players.items())
+        players_in_game = list(self.playing_players.items())
         for (m, (tr, start_time)) in players_in_game:
             end_time = start_time + game_length
             if datetime.now() > end_time: # if we have passed the game end time...
                 # remove them from playing and put them back in selected
                 del self.playing_players[m]
                 self.selected_players[m] = tr
+                self.lobbies.add(m, tr)
+                PRUNED_TOTAL.inc("game_over")
 
 
-        to_delete: list[User] = []
+        to_delete: list[tuple[UserId, Availability]] = []
+        now = get_now_rounded()
         for m, (tr, _sel) in self.items():
-            if tr.get_end_time_available() < get_now_rounded():
-                await debug_log(f"pruning player {m.name} (end time {fmt_dt(tr.get_end_time_available())})")
-                to_delete.append(m)
-        for m in to_delete:
+            if tr.get_end_time_available() < now:
+                to_delete.append((m, tr))
+            elif type(tr) is IntervalSet:
+                tr.trim_before(now)
+        for m, _tr in to_delete:
             self.delete(m)
-        if len(self) < g_players_needed:
+        PRUNED_TOTAL.inc("expired", amount=len(to_delete))
+        if len(self) < self.players_needed:
             self.reselect_first_available_players()
-
-
-
-
-
-g_available_players: AvailablePlayers = AvailablePlayers()
+        return to_delete
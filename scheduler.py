@@ -0,0 +1,142 @@
+"""
+Timed reminders from one heap and one task per process, instead of a sleeping coroutine each.
+
+Reminders are rounded up to the minute, so everything due in the same minute is handed to
+`deliver` together and can go out as one message per channel. Scheduling and cancelling
+are O(log n); cancelled reminders are dropped lazily and the heap is compacted when more
+than half of it is dead.
+"""
+import asyncio
+import heapq
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import datetime, timedelta
+
+from utils import get_now
+
+logger = logging.getLogger(__name__)
+
+# compact the heap when at least this many entries, and half of it, are cancelled
+COMPACT_AT: int = 64
+
+
+class Reminder:
+    __slots__ = ("when", "seq", "key", "guild_id", "user_id", "text", "cancelled")
+
+    def __init__(self, when: datetime, seq: int, key: Hashable, guild_id: int, user_id: int, text: str):
+        self.when: datetime = when
+        self.seq: int = seq
+        self.key: Hashable = key
+        self.guild_id: int = guild_id
+        self.user_id: int = user_id
+        self.text: str = text
+        self.cancelled: bool = False
+
+    def __lt__(self, other: "Reminder") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def __repr__(self) -> str:
+        return f"<Reminder {self.key} at {self.when}>"
+
+
+async def _no_delivery(reminders: list[Reminder]) -> None:
+    logger.warning("dropping %d reminders, nothing delivers them", len(reminders))
+
+
+class Scheduler:
+    def __init__(self, deliver: Callable[[list[Reminder]], Awaitable[None]] = _no_delivery):
+        """
+        :param deliver: called with every reminder due in a minute, in time order
+        """
+        self.deliver: Callable[[list[Reminder]], Awaitable[None]] = deliver
+        self.heap: list[Reminder] = []
+        # key : the live reminder with that key
+        self.by_key: dict[Hashable, Reminder] = {}
+        self.cancelled: int = 0
+        self.seq: int = 0
+        self.task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def schedule(self, when: datetime, key: Hashable, guild_id: int, user_id: int, text: str) -> Reminder:
+        """
+        Remind `user_id` at `when` (rounded up to the minute), replacing any reminder with the same key
+        """
+        self.cancel(key)
+        if when.second or when.microsecond:
+            when = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        self.seq += 1
+        reminder = Reminder(when, self.seq, key, guild_id, user_id, text)
+        self.by_key[key] = reminder
+        earliest = self.heap[0].when if self.heap else None
+        heapq.heappush(self.heap, reminder)
+        if self._wake is not None and (earliest is None or when < earliest):
+            self._wake.set()
+        return reminder
+
+    def cancel(self, key: Hashable) -> bool:
+        reminder = self.by_key.pop(key, None)
+        if reminder is None:
+            return False
+        reminder.cancelled = True
+        self.cancelled += 1
+        if self.cancelled >= COMPACT_AT and self.cancelled * 2 > len(self.heap):
+            self.heap = [r for r in self.heap if not r.cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
+        return True
+
+    def pop_due(self, now: datetime) -> list[Reminder]:
+        due: list[Reminder] = []
+        while self.heap and self.heap[0].when <= now:
+            reminder = heapq.heappop(self.heap)
+            if reminder.cancelled:
+                self.cancelled -= 1
+                continue
+            del self.by_key[reminder.key]
+            due.append(reminder)
+        return due
+
+    def start(self) -> asyncio.Task:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def run(self) -> None:
+        self._wake = wake = asyncio.Event()
+        while True:
+            wake.clear()
+            while self.heap and self.heap[0].cancelled:
+                heapq.heappop(self.heap)
+                self.cancelled -= 1
+            if not self.heap:
+                await wake.wait()
+                continue
+            delay = (self.heap[0].when - get_now()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wake.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+            due = self.pop_due(get_now())
+            try:
+                await self.deliver(due)
+            except Exception:
+                logger.exception("failed to deliver %d reminders", len(due))
+
+
+g_scheduler: Scheduler = Scheduler()
+
+# how long before the agreed start to remind selected players, and before a backup's
+# availability runs out to tell them. None turns a reminder off.
+g_start_reminder: timedelta | None = timedelta(minutes=10)
+g_end_reminder: timedelta | None = timedelta(minutes=15)
+
+
+def configure_reminders(start_minutes: int | None, end_minutes: int | None) -> None:
+    global g_start_reminder, g_end_reminder
+    g_start_reminder = None if start_minutes is None else timedelta(minutes=start_minutes)
+    g_end_reminder = None if end_minutes is None else timedelta(minutes=end_minutes)
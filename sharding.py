@@ -0,0 +1,145 @@
+#!/bin/env python3
+"""
+Run the bot as several processes, each connecting a contiguous range of gateway shards.
+Guild state lives in the process that owns the guild's shard, so processes never share state.
+The launcher doubles as a coordinator: every process reports its per-shard load to it.
+
+usage: python3.14 sharding.py --shards 16 --processes 4
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any
+
+from guild_state import guild_states_by_shard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COORDINATOR_PORT = 8765
+REPORT_INTERVAL: float = 30.0
+
+
+def shard_ranges(shard_count: int, processes: int) -> list[list[int]]:
+    """
+    Split shards 0..shard_count-1 into `processes` contiguous, nearly equal ranges
+    """
+    if not (0 < processes <= shard_count):
+        raise ValueError(f"Need between 1 and {shard_count} processes, not {processes}")
+    per, extra = divmod(shard_count, processes)
+    ranges: list[list[int]] = []
+    start = 0
+    for i in range(processes):
+        end = start + per + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def load_report(client: Any) -> dict[str, Any]:
+    """
+    What this process is carrying, per shard
+    :param client: the discord client, only its latencies are used
+    """
+    latencies: dict[int, float] = dict(getattr(client, "latencies", None) or [(client.shard_id or 0, client.latency)])
+    shards: dict[int, dict[str, float]] = {
+        shard_id: {"guilds": 0, "players": 0, "latency": latency} for shard_id, latency in latencies.items()
+    }
+    for shard_id, states in guild_states_by_shard().items():
+        load = shards.setdefault(shard_id, {"guilds": 0, "players": 0, "latency": float("nan")})
+        load["guilds"] = len(states)
+        load["players"] = sum(len(s.available_players) + len(s.available_players.playing_players) for s in states)
+    return {"pid": os.getpid(), "time": time.time(), "shards": shards}
+
+
+async def report_load(port: int, client: Any, interval: float = REPORT_INTERVAL, host: str = "127.0.0.1") -> None:
+    """
+    Send `load_report` to the coordinator every `interval` seconds, forever
+    """
+    writer: asyncio.StreamWriter | None = None
+    while True:
+        try:
+            if writer is None:
+                _reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps(load_report(client)).encode() + b"\n")
+            await writer.drain()
+        except OSError as e:
+            logger.warning("couldn't report load to coordinator on port %d: %s", port, e)
+            writer = None
+        await asyncio.sleep(interval)
+
+
+class ShardCoordinator:
+    def __init__(self):
+        # shard id : latest report for that shard (plus the pid that sent it)
+        self.loads: dict[int, dict[str, Any]] = {}
+
+    def record(self, report: dict[str, Any]) -> None:
+        for shard_id, load in report["shards"].items():
+            self.loads[int(shard_id)] = {**load, "pid": report["pid"], "time": report["time"]}
+
+    async def handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    self.record(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    logger.error("bad load report %r: %s", line, e)
+        finally:
+            writer.close()
+
+    async def serve(self, port: int, host: str = "127.0.0.1") -> asyncio.Server:
+        return await asyncio.start_server(self.handle_worker, host, port)
+
+    def summary(self) -> str:
+        lines = ["shard   pid     guilds  players  latency"]
+        for shard_id, load in sorted(self.loads.items()):
+            lines.append(
+                f"{shard_id:>5}  {load['pid']:>6}  {load['guilds']:>6}  {load['players']:>7}  {load['latency'] * 1000:>5.0f}ms"
+            )
+        return "\n".join(lines)
+
+
+async def run_launcher(shard_count: int, processes: int, port: int, report_every: float) -> int:
+    coordinator = ShardCoordinator()
+    server = await coordinator.serve(port)
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    procs: list[asyncio.subprocess.Process] = []
+    for shard_ids in shard_ranges(shard_count, processes):
+        env = {
+            **os.environ,
+            "SHARD_COUNT": str(shard_count),
+            "SHARD_IDS": ",".join(map(str, shard_ids)),
+            "COORDINATOR_PORT": str(port),
+        }
+        procs.append(await asyncio.create_subprocess_exec(sys.executable, main_py, env=env))
+        logger.info("started pid %d for shards %s", procs[-1].pid, shard_ids)
+
+    async def log_summary():
+        while True:
+            await asyncio.sleep(report_every)
+            logger.info("shard load:\n%s", coordinator.summary())
+
+    summary_task = asyncio.create_task(log_summary())
+    codes = await asyncio.gather(*(p.wait() for p in procs))
+    summary_task.cancel()
+    server.close()
+    return max(codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, required=True, help="total number of gateway shards")
+    parser.add_argument("--processes", type=int, required=True, help="how many bot processes to split them over")
+    parser.add_argument("--port", type=int, default=DEFAULT_COORDINATOR_PORT, help="coordinator port on localhost")
+    parser.add_argument("--report-every", type=float, default=REPORT_INTERVAL, help="seconds between load summaries")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(run_launcher(args.shards, args.processes, args.port, args.report_every)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+The commands in `func_map` as discord application (slash) commands.
+
+With these, the bot doesn't need the message content intent, so discord stops sending
+it the text of every message in every channel just so it can look for a "!".
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+import discord
+from discord import app_commands
+
+from command_handlers import CommandHandler, func_map, G_PREFIX
+from guild_state import get_guild_state
+from metrics import COMMANDS_TOTAL, DISPATCH_SECONDS
+from utils import use_tz
+
+logger = logging.getLogger(__name__)
+
+
+class InteractionMessage:
+    """
+    Looks enough like a `discord.Message` for the command handlers.
+    The interaction is deferred straight away (handlers can take a while) and
+    every reply becomes a followup.
+    """
+
+    def __init__(self, interaction: discord.Interaction, content: str):
+        self.interaction: discord.Interaction = interaction
+        self.id: int = interaction.id
+        self.author = interaction.user
+        self.channel = interaction.channel
+        self.guild = interaction.guild
+        self.created_at: datetime = interaction.created_at
+        self.content: str = content
+        self.replied: bool = False
+
+    async def defer(self) -> None:
+        if not self.interaction.response.is_done():
+            await self.interaction.response.defer(thinking=True)
+
+    async def reply(self, content: str, **kwargs) -> Any:
+        self.replied = True
+        if not self.interaction.response.is_done():
+            return await self.interaction.response.send_message(content, **kwargs)
+        return await self.interaction.followup.send(content, wait=True, **kwargs)
+
+    async def add_reaction(self, emoji: str) -> None:
+        # there's no message to react to, so the reaction is the reply
+        await self.reply(emoji)
+
+
+async def run_slash_command(interaction: discord.Interaction, name: str, args: str = "") -> None:
+    received = time.perf_counter()
+    if interaction.guild is None:
+        await interaction.response.send_message("I only work in servers", ephemeral=True)
+        return
+    handler: CommandHandler = func_map[name]
+    message = InteractionMessage(interaction, f"{G_PREFIX}{name} {args}".strip())
+    await message.defer()
+    COMMANDS_TOTAL.inc(name)
+    DISPATCH_SECONDS.observe(time.perf_counter() - received)
+    try:
+        with use_tz(get_guild_state(interaction.guild.id).zone):
+            await handler(message, args)  # pyright: ignore[reportArgumentType]
+    except BaseException:
+        logger.exception("failed to run /%s", name)
+        await message.reply("failed to run command due to internal error. sorry.")
+        return
+    if not message.replied:
+        # the handler only posted to the game channel, close out the "thinking..."
+        await message.reply("👍")
+
+
+def _describe(handler: CommandHandler, name: str) -> str:
+    doc = (handler.__doc__ or "").strip()
+    return doc.splitlines()[0][:100] if doc else f"{G_PREFIX}{name}"
+
+
+def build_command_tree(client: discord.Client) -> app_commands.CommandTree:
+    """
+    Register every command in `func_map`. The ones that take arguments get typed
+    options so discord validates them before we ever see them.
+    """
+    tree = app_commands.CommandTree(client)
+
+    @tree.command(name="available", description="Say when you can play")
+    @app_commands.describe(when='like "7-9", "until 11", "in 30 min for 2 hours" (default: now for 3 hours)')
+    async def available(interaction: discord.Interaction, when: str | None = None):
+        await run_slash_command(interaction, "available", when or "")
+
+    @tree.command(name="count", description="Show or set how many players a game needs")
+    @app_commands.describe(players="players needed for a game")
+    async def count(interaction: discord.Interaction, players: app_commands.Range[int, 1, 100] | None = None):
+        await run_slash_command(interaction, "count", "" if players is None else str(players))
+
+    @tree.command(name="timezone", description="Show or set the server's timezone (or just yours)")
+    @app_commands.describe(zone="a tz database name like America/Toronto", just_me="only change your own timezone")
+    async def timezone(interaction: discord.Interaction, zone: str | None = None, just_me: bool = False):
+        args = "" if zone is None else (f"me {zone}" if just_me else zone)
+        await run_slash_command(interaction, "timezone", args)
+
+    typed = {c.name for c in tree.get_commands()}
+    for name, handler in func_map.items():
+        if name in typed:
+            continue
+
+        def make_callback(name: str):
+            async def callback(interaction: discord.Interaction):
+                await run_slash_command(interaction, name)
+
+            return callback
+
+        tree.add_command(app_commands.Command(name=name, description=_describe(handler, name), callback=make_callback(name)))
+    return tree
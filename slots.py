@@ -0,0 +1,139 @@
+"""
+Availability as bitmaps over fixed time slots (5 minutes over a rolling 48 hours by default).
+
+Bit i of a player's bitmap is set when they're free for all of slot i, so "when is everyone
+free" is an AND of ints and "how many people are free in each slot" is a column-wise
+popcount, done here with bit-sliced counters instead of a loop per slot per player.
+"""
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Protocol
+
+SLOT_LENGTH: timedelta = timedelta(minutes=5)
+WINDOW_LENGTH: timedelta = timedelta(hours=48)
+
+
+class HasTimeRange(Protocol):
+    start_time_available: datetime
+
+    def get_end_time_available(self) -> datetime: ...
+
+
+class SlotWindow:
+    def __init__(self, start: datetime, slot_length: timedelta = SLOT_LENGTH, length: timedelta = WINDOW_LENGTH):
+        """
+        :param start: rounded down to a slot boundary to make the first slot
+        """
+        self.slot_length: timedelta = slot_length
+        # measured from midnight so every window with the same slot length lines up
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.origin: datetime = start - (start - midnight) % slot_length
+        self.slots: int = length // slot_length
+
+    def slot_of(self, t: datetime) -> int:
+        """
+        The slot `t` falls in (may be outside the window)
+        """
+        return (t - self.origin) // self.slot_length
+
+    def time_of(self, slot: int) -> datetime:
+        return self.origin + slot * self.slot_length
+
+    def contains(self, t: datetime) -> bool:
+        return 0 <= self.slot_of(t) < self.slots
+
+    def bitmap(self, tr: HasTimeRange) -> int:
+        """
+        Slots completely inside the time range (or each range of an IntervalSet), clipped to the window
+        """
+        intervals = getattr(tr, "intervals", None)
+        if intervals is not None:
+            bitmap = 0
+            for start, end in intervals():
+                bitmap |= self.interval_bitmap(start, end)
+            return bitmap
+        return self.interval_bitmap(tr.start_time_available, tr.get_end_time_available())
+
+    def interval_bitmap(self, start: datetime, end: datetime) -> int:
+        first = -(-(start - self.origin) // self.slot_length)  # round up
+        last = self.slot_of(end)  # exclusive
+        first, last = max(first, 0), min(last, self.slots)
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+
+def common(bitmaps: Iterable[int]) -> int:
+    """
+    Slots where everyone is free
+    """
+    result: int | None = None
+    for b in bitmaps:
+        result = b if result is None else result & b
+    return result or 0
+
+
+def first_slot(bitmap: int) -> int | None:
+    if bitmap <= 0:
+        return None
+    return (bitmap & -bitmap).bit_length() - 1
+
+
+def free_slots(bitmap: int) -> int:
+    return bitmap.bit_count()
+
+
+class SlotCounter:
+    """
+    Per-slot headcounts kept as bit planes: plane i holds bit i of every slot's count,
+    so adding a player is a ripple-carry add over log2(players) ints.
+    """
+
+    def __init__(self, bitmaps: Iterable[int] = ()):
+        self.planes: list[int] = []
+        for b in bitmaps:
+            self.add(b)
+
+    def add(self, bitmap: int) -> None:
+        carry = bitmap
+        for i, plane in enumerate(self.planes):
+            if carry == 0:
+                return
+            self.planes[i], carry = plane ^ carry, plane & carry
+        if carry:
+            self.planes.append(carry)
+
+    def count_at(self, slot: int) -> int:
+        return sum(((plane >> slot) & 1) << i for i, plane in enumerate(self.planes))
+
+    def at_least(self, n: int) -> int:
+        """
+        Bitmap of the slots where at least `n` players are free
+        """
+        if n <= 0:
+            return -1
+        if n >= 1 << len(self.planes):
+            return 0
+        # compare every slot's count against n at once, from the most significant plane down
+        greater, equal = 0, -1
+        for i in reversed(range(len(self.planes))):
+            plane = self.planes[i]
+            if (n >> i) & 1:
+                equal &= plane
+            else:
+                greater |= equal & plane
+                equal &= ~plane
+        return greater | equal
+
+    def counts(self, slots: int) -> list[int]:
+        return [self.count_at(s) for s in range(slots)]
+
+
+def common_start_time(ranges: list[HasTimeRange], window: SlotWindow) -> datetime | None:
+    """
+    Like `TimeRange.get_common_start_time`, at slot resolution
+    """
+    if len(ranges) == 0:
+        return None
+    slot = first_slot(common(window.bitmap(r) for r in ranges))
+    return None if slot is None else window.time_of(slot)
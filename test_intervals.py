@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from intervals import IntervalSet, get_common_start_time, parse_availability
+from slots import SlotWindow
+from times import TimeRange
+from utils import TimeSyntaxError, time_today
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return time_today(time(hour=hour, minute=minute))
+
+
+class TestIntervalSet:
+    def test_merges(self):
+        s = IntervalSet([(at(19), at(21)), (at(13), at(14)), (at(20), at(22)), (at(14), at(15))])
+        assert [(at(13), at(15)), (at(19), at(22))] == s.intervals()
+        assert at(13) == s.start_time_available
+        assert at(22) == s.get_end_time_available()
+
+    def test_contains(self):
+        s = IntervalSet([(at(13), at(15)), (at(19), at(22))])
+        assert s.time_in_range(at(13))
+        assert s.time_in_range(at(15))
+        assert not s.time_in_range(at(16))
+        assert s.time_in_range(at(20, 30))
+        assert not s.time_in_range(at(12))
+        assert not s.time_in_range(at(23))
+
+    def test_union(self):
+        s = IntervalSet([(at(13), at(15)), (at(19), at(22))])
+        assert [(at(13), at(22))] == s.union(IntervalSet([(at(14), at(20))])).intervals()
+        assert [(at(10), at(11)), (at(13), at(15)), (at(19), at(22))] == s.union(IntervalSet([(at(10), at(11))])).intervals()
+        assert 2 == len(s)  # unchanged
+
+    def test_intersection(self):
+        s = IntervalSet([(at(13), at(15)), (at(19), at(22))])
+        t = IntervalSet([(at(14), at(20)), (at(21), at(23))])
+        assert [(at(14), at(15)), (at(19), at(20)), (at(21), at(22))] == s.intersection(t).intervals()
+        assert not s.intersection(IntervalSet([(at(16), at(18))]))
+
+    def test_trim_before(self):
+        s = IntervalSet([(at(13), at(15)), (at(19), at(22))])
+        s.trim_before(at(16))
+        assert [(at(19), at(22))] == s.intervals()
+
+
+class TestParseAvailability:
+    def test_single_range_is_time_range(self):
+        assert type(parse_availability("7-9", now=at(12))) is TimeRange
+
+    def test_several_ranges(self):
+        for string in ["7-9 and 10-12", "7-9, 10-12", "7-9 & 10-12"]:
+            s = parse_availability(string, now=at(12))
+            assert isinstance(s, IntervalSet)
+            assert [(at(19), at(21)), (at(22), at(22) + timedelta(hours=2))] == s.intervals()
+
+    def test_bad_part(self):
+        with pytest.raises(TimeSyntaxError):
+            parse_availability("7-9 and hello", now=at(12))
+
+    def test_common_start_time(self):
+        now = at(12)
+        a = parse_availability("5-7 and 9-11", now=now)
+        b = parse_availability("6-10", now=now)
+        assert at(18) == get_common_start_time([a, b])
+        c = parse_availability("9:30-10", now=now)
+        assert at(21, 30) == get_common_start_time([a, b, c])
+        assert get_common_start_time([a, parse_availability("7:30-8:30", now=now)]) is None
+
+    def test_bitmap(self):
+        now = at(12)
+        window = SlotWindow(now)
+        s = parse_availability("12-12:10 and 12:20-12:30", now=now)
+        assert 0b110011 == window.bitmap(s)
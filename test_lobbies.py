@@ -0,0 +1,110 @@
+import random
+from datetime import time, timedelta
+
+from intervals import IntervalSet
+from lobbies import Lobbies, pack
+from players import AvailablePlayers
+from times import TimeRange
+from utils import time_today
+
+NOW = time_today(time(hour=12))
+
+
+def window(start_hour: float, hours: float) -> TimeRange:
+    tr = TimeRange("", now=NOW)
+    tr.start_time_available = NOW + timedelta(hours=start_hour)
+    tr.duration_available = timedelta(hours=hours)
+    return tr
+
+
+def check(lobbies, ranges, size):
+    seen = set()
+    for lobby in lobbies:
+        assert size == len(lobby)
+        for p in lobby.players:
+            assert p not in seen
+            seen.add(p)
+            assert ranges[p].time_in_range(lobby.start)
+
+
+class TestLobbies:
+    def test_three_games_from_seventeen(self):
+        ranges = {i: window(i % 3, 2) for i in range(17)}
+        lobbies, rest = pack(ranges, 5)
+        assert 3 == len(lobbies)
+        assert 2 == len(rest)
+        check(lobbies, ranges, 5)
+
+    def test_earliest_deadline(self):
+        # seating the long windows first would strand the short ones
+        ranges = {0: window(0, 1), 1: window(0, 1), 2: window(0, 10), 3: window(0, 10), 4: window(5, 1), 5: window(5, 1)}
+        lobbies, rest = pack(ranges, 2)
+        assert 3 == len(lobbies)
+        assert [] == rest
+        check(lobbies, ranges, 2)
+
+    def test_interval_sets(self):
+        split = IntervalSet([(NOW, NOW + timedelta(hours=1)), (NOW + timedelta(hours=3), NOW + timedelta(hours=4))])
+        ranges = {0: split, 1: window(3, 1), 2: window(3.5, 1)}
+        lobbies, rest = pack(ranges, 3)
+        assert 1 == len(lobbies)
+        assert NOW + timedelta(hours=3.5) == lobbies[0].start
+
+    def test_random_pools_are_valid(self):
+        rng = random.Random(2)
+        for n in [10, 50, 200]:
+            ranges = {i: window(rng.uniform(0, 12), rng.uniform(0.5, 4)) for i in range(n)}
+            lobbies, rest = pack(ranges, 5)
+            check(lobbies, ranges, 5)
+            assert n == 5 * len(lobbies) + len(rest)
+
+    def test_incremental(self):
+        lobbies = Lobbies(2)
+        lobbies.add(1, window(0, 2))
+        assert [] == lobbies.lobbies
+        lobbies.add(2, window(1, 2))
+        assert 1 == len(lobbies.lobbies)
+        game = lobbies.lobbies[0]
+        lobbies.add(3, window(0, 3))
+        lobbies.add(4, window(5, 1))
+        # 3 fills in for 2 without breaking up the game
+        lobbies.remove(2)
+        assert game is lobbies.lobby_of[1] is lobbies.lobby_of[3]
+        # nobody can fill in for 3, so 1 waits again
+        lobbies.remove(3)
+        assert [] == lobbies.lobbies
+        assert [1, 4] == lobbies.waiting()
+        lobbies.add(5, window(5.5, 1))
+        assert {4, 5} == set(lobbies.lobbies[0].players)
+
+    def test_available_players(self):
+        players = AvailablePlayers(2)
+        for i in range(5):
+            players.add_player(i, window(0, 2))
+        assert 2 == len(players.lobby_assignments())
+        players.players_needed = 5
+        assert 1 == len(players.lobby_assignments())
+        players.delete(0)
+        assert [] == players.lobby_assignments()
+
+
+class TestBatch:
+    def test_add_players_matches_one_at_a_time(self):
+        rng = random.Random(3)
+        roster = [(i, window(rng.uniform(0, 6), rng.uniform(0.5, 3))) for i in range(60)]
+        single, batched = AvailablePlayers(), AvailablePlayers()
+        for player, tr in roster:
+            single.add_player(player, tr)
+        batched.add_players(roster)
+        assert single.keys() == batched.keys()
+        check(batched.lobby_assignments(), dict(roster), 5)
+        assert len(batched.lobby_assignments()) >= len(single.lobby_assignments())
+
+    def test_apply_batch(self):
+        players = AvailablePlayers(2)
+        players.apply_batch([("add", 1, window(0, 2)), ("add", 2, window(0, 2)), ("add", 3, window(0, 2)), ("remove", 2)])
+        assert [1, 3] == players.keys()
+        assert {1, 3} == set(players.lobby_assignments()[0].players)
+        # new times replace the old ones instead of adding the player twice
+        players.apply_batch([("add", 1, window(1, 2))])
+        assert [1, 3] == players.keys()
@@ -0,0 +1,34 @@
+from metrics import Counter, Gauge, Histogram, render, g_registry
+
+
+class TestMetrics:
+    def test_counter(self):
+        c = Counter("test_counter_total", "a counter", ("command",))
+        c.inc("status")
+        c.inc("status", amount=2)
+        assert 3 == c.get("status")
+        assert 0 == c.get("available")
+        assert 'test_counter_total{command="status"} 3' in render()
+        g_registry.remove(c)
+
+    def test_histogram(self):
+        h = Histogram("test_seconds", "a histogram", buckets=(0.1, 1.0))
+        h.observe(0.05)
+        h.observe(0.5)
+        h.observe(5)
+        assert 3 == h.count()
+        text = render()
+        assert 'test_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_seconds_bucket{le="1.0"} 2' in text
+        assert 'test_seconds_bucket{le="+Inf"} 3' in text
+        assert "test_seconds_count 3" in text
+        g_registry.remove(h)
+
+    def test_gauge_function_is_lazy(self):
+        calls = []
+        g = Gauge("test_gauge", "a gauge", ("pool",))
+        g.set_function(lambda: calls.append(1) or [(("selected",), 4)])
+        assert len(calls) == 0
+        assert 'test_gauge{pool="selected"} 4' in render()
+        assert len(calls) == 1
+        g_registry.remove(g)
@@ -0,0 +1,106 @@
+import asyncio
+import types
+
+import discord
+
+from fake_discord import FakeChannel, FakeGuild, FakeMessage, FakeUser
+from guild_state import g_guild_states
+from main import on_message
+from notifier import Notifier, set_notifier
+
+
+class FlakyUser(FakeUser):
+    """
+    Fails the first `failures` sends with a 503
+    """
+
+    def __init__(self, name: str, failures: int):
+        super().__init__(name)
+        self.failures = failures
+
+    async def send(self, content: str):
+        if self.failures > 0:
+            self.failures -= 1
+            raise discord.HTTPException(types.SimpleNamespace(status=503, reason="unavailable"), "try again")
+        return await super().send(content)
+
+
+def notifier_for(users: list[FakeUser], **kwargs) -> Notifier:
+    by_id = {u.id: u for u in users}
+
+    async def get_user(user_id: int) -> FakeUser:
+        return by_id[user_id]
+
+    return Notifier(get_user=get_user, backoff=0, **kwargs)
+
+
+class TestNotifier:
+    def test_consolidates_and_dedupes(self):
+        users = [FakeUser(f"p{i}") for i in range(3)]
+
+        async def run():
+            notifier = notifier_for(users, window=0.01)
+            ids = [u.id for u in users]
+            notifier.notify(ids, "game at 7", ("agreed", 1))
+            notifier.notify(ids, "game at 7", ("agreed", 1))
+            notifier.notify(ids[:1], "time to play", ("start", 1))
+            await notifier.drain()
+
+        asyncio.run(run())
+        assert ["game at 7\ntime to play"] == users[0].dms
+        assert ["game at 7"] == users[1].dms == users[2].dms
+
+    def test_retries(self):
+        flaky, dead = FlakyUser("flaky", failures=2), FlakyUser("dead", failures=10)
+
+        async def run():
+            notifier = notifier_for([flaky, dead], window=0, retries=3)
+            notifier.notify([flaky.id, dead.id], "hello", "k")
+            await notifier.drain()
+
+        asyncio.run(run())
+        assert ["hello"] == flaky.dms
+        assert [] == dead.dms
+
+    def test_concurrency_limit(self):
+        in_flight, most = 0, 0
+
+        class SlowUser(FakeUser):
+            async def send(self, content: str):
+                nonlocal in_flight, most
+                in_flight += 1
+                most = max(most, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        users = [SlowUser(f"p{i}") for i in range(20)]
+
+        async def run():
+            notifier = notifier_for(users, window=0, concurrency=4)
+            notifier.notify([u.id for u in users], "go", "k")
+            await notifier.drain()
+
+        asyncio.run(run())
+        assert 4 == most
+
+    def test_game_start_dms_players(self):
+        g_guild_states.clear()
+        guild = FakeGuild(name="server")
+        channel = FakeChannel(guild)
+        users = [FakeUser(f"p{i}") for i in range(2)]
+
+        async def run():
+            notifier = notifier_for(users, window=0.01)
+            set_notifier(notifier)
+            try:
+                await on_message(FakeMessage("!count 2", users[0], channel))
+                for u in users:
+                    await on_message(FakeMessage("!available for 1 hour", u, channel))
+                await notifier.drain()
+            finally:
+                set_notifier(None)
+
+        asyncio.run(run())
+        for u in users:
+            assert 1 == len(u.dms)
+            assert "server #general" in u.dms[0] and "Time to play" in u.dms[0]
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import timedelta
+
+from command_handlers import deliver_reminders
+from fake_discord import FakeChannel, FakeGuild, FakeMessage, FakeUser
+from guild_state import g_guild_states
+from main import on_message
+from scheduler import COMPACT_AT, Reminder, Scheduler, g_scheduler
+from utils import get_now
+
+
+class TestScheduler:
+    def test_rounds_up_and_replaces(self):
+        s = Scheduler()
+        now = get_now().replace(second=30)
+        r = s.schedule(now, "a", 1, 1, "hi")
+        assert 0 == r.when.second and r.when > now
+        s.schedule(now + timedelta(minutes=5), "a", 1, 1, "later")
+        assert 1 == len(s)
+        assert [] == s.pop_due(now + timedelta(minutes=1))
+        assert ["later"] == [r.text for r in s.pop_due(now + timedelta(minutes=6))]
+
+    def test_compacts(self):
+        s = Scheduler()
+        now = get_now()
+        for i in range(COMPACT_AT * 2):
+            s.schedule(now + timedelta(minutes=i), i, 1, i, "x")
+        for i in range(COMPACT_AT + 1):
+            s.cancel(i)
+        assert COMPACT_AT - 1 == len(s) == len(s.heap)
+
+    def test_same_minute_is_one_delivery(self):
+        batches: list[list[Reminder]] = []
+
+        async def deliver(reminders: list[Reminder]) -> None:
+            batches.append(reminders)
+
+        async def run():
+            s = Scheduler(deliver)
+            task = s.start()
+            await asyncio.sleep(0)
+            past = get_now() - timedelta(minutes=1)
+            for i in range(3):
+                s.schedule(past.replace(second=10 * i), i, 1, i, "x")
+            s.schedule(get_now() + timedelta(hours=1), "later", 1, 9, "y")
+            await asyncio.sleep(0.05)
+            task.cancel()
+            return s
+
+        s = asyncio.run(run())
+        assert [[0, 1, 2]] == [[r.key for r in batch] for batch in batches]
+        assert 1 == len(s)
+
+    def test_backup_reminder(self):
+        g_guild_states.clear()
+        g_scheduler.heap.clear()
+        g_scheduler.by_key.clear()
+        channel = FakeChannel(FakeGuild())
+        users = [FakeUser(f"p{i}") for i in range(3)]
+
+        async def run():
+            await on_message(FakeMessage("!count 1", users[0], channel))
+            for u in users:
+                await on_message(FakeMessage("!available in 1 hour for 1 hour", u, channel))
+            await deliver_reminders(g_scheduler.pop_due(get_now() + timedelta(hours=2)))
+
+        asyncio.run(run())
+        reminder = channel.sent[-1]
+        assert f"{users[1].mention} {users[2].mention} your availability ends at" in reminder
+        assert users[0].mention not in reminder
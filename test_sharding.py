@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+from fake_discord import FakeChannel, FakeGuild, FakeMessage, FakeUser
+from guild_state import g_guild_states, set_shard_count, shard_for_guild
+from main import on_message
+from sharding import ShardCoordinator, load_report, shard_ranges
+
+
+class FakeGateway:
+    """
+    Just the parts of an AutoShardedClient that load reports read
+    """
+    shard_id = None
+    latency = 0.05
+
+    def __init__(self, shard_ids: list[int]):
+        self.latencies = [(i, 0.05) for i in shard_ids]
+
+
+class TestSharding:
+    def setup_method(self):
+        g_guild_states.clear()
+        set_shard_count(1)
+
+    def test_shard_ranges(self):
+        assert [[0, 1, 2], [3, 4], [5, 6]] == shard_ranges(7, 3)
+        assert [[0]] == shard_ranges(1, 1)
+        for shards, procs in [(16, 4), (10, 3), (5, 5)]:
+            ranges = shard_ranges(shards, procs)
+            assert list(range(shards)) == [i for r in ranges for i in r]
+
+    def test_shard_for_guild(self):
+        guild_id = 81384788765712384
+        assert 0 == shard_for_guild(guild_id, 1)
+        assert (guild_id >> 22) % 4 == shard_for_guild(guild_id, 4)
+
+    def test_guild_state_is_per_guild(self):
+        guild_a, guild_b = FakeGuild(1 << 22), FakeGuild(2 << 22)
+        channel_a, channel_b = FakeChannel(guild_a), FakeChannel(guild_b)
+        user = FakeUser("alice")
+
+        async def run():
+            await on_message(FakeMessage("!available for 2 hours", user, channel_a))
+            await on_message(FakeMessage("!count 3", user, channel_b))
+
+        asyncio.run(run())
+        a, b = g_guild_states[guild_a.id], g_guild_states[guild_b.id]
+        assert user.id in a.available_players.keys()
+        assert user.id not in b.available_players.keys()
+        assert 5 == a.players_needed
+        assert 3 == b.players_needed
+        assert channel_a is a.channel and channel_b is b.channel
+
+    def test_coordinator_collects_reports(self):
+        set_shard_count(2)
+        guild = FakeGuild(1 << 22)  # lands on shard 1
+        channel = FakeChannel(guild)
+
+        async def run() -> ShardCoordinator:
+            await on_message(FakeMessage("!available for 2 hours", FakeUser("bob"), channel))
+            coordinator = ShardCoordinator()
+            server = await coordinator.serve(0)
+            port = server.sockets[0].getsockname()[1]
+            _reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(json.dumps(load_report(FakeGateway([0, 1]))).encode() + b"\n")
+            await writer.drain()
+            writer.close()
+            for _ in range(100):
+                if len(coordinator.loads) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            server.close()
+            return coordinator
+
+        coordinator = asyncio.run(run())
+        assert 0 == coordinator.loads[0]["guilds"]
+        assert 1 == coordinator.loads[1]["guilds"]
+        assert 1 == coordinator.loads[1]["players"]
+        assert "shard" in coordinator.summary()
+
+    def test_roster(self):
+        guild = FakeGuild()
+        channel = FakeChannel(guild)
+        admin, alice, bob = FakeUser("admin", admin=True), FakeUser("alice"), FakeUser("bob")
+        roster = FakeMessage(f"!roster\n{alice.mention} for 2 hours\n{bob.mention} in 1 hour for 1 hour and in 3 hours for 1 hour\nnobody 7-9", admin, channel)
+
+        async def run():
+            await on_message(FakeMessage(f"!roster\n{alice.mention} for 2 hours", alice, channel))
+            await on_message(roster)
+
+        asyncio.run(run())
+        state = g_guild_states[guild.id]
+        assert [alice.id, bob.id] == state.available_players.keys()
+        assert roster.replies[0].startswith("Added 2 players")
+        assert "nobody 7-9" in roster.replies[0]
@@ -0,0 +1,42 @@
+import asyncio
+
+import discord
+
+from command_handlers import func_map
+from fake_discord import FakeChannel, FakeGuild, FakeInteraction, FakeUser
+from guild_state import g_guild_states
+from slash_commands import build_command_tree, run_slash_command
+
+
+class TestSlashCommands:
+    def setup_method(self):
+        g_guild_states.clear()
+
+    def test_every_command_is_registered(self):
+        tree = build_command_tree(discord.Client(intents=discord.Intents.default()))
+        assert set(func_map.keys()) == {c.name for c in tree.get_commands()}
+
+    def test_available_and_status(self):
+        guild = FakeGuild()
+        channel = FakeChannel(guild)
+        user = FakeUser("carol")
+
+        async def run() -> tuple[FakeInteraction, FakeInteraction]:
+            available = FakeInteraction(user, channel)
+            await run_slash_command(available, "available", "for 2 hours")
+            status = FakeInteraction(user, channel)
+            await run_slash_command(status, "status")
+            return available, status
+
+        available, status = asyncio.run(run())
+        assert available.response.deferred
+        assert ["👍"] == available.sent
+        assert user.id in g_guild_states[guild.id].available_players.keys()
+        assert "carol" in status.sent[0]
+
+    def test_handler_without_reply_still_answers(self):
+        channel = FakeChannel(FakeGuild())
+        interaction = FakeInteraction(FakeUser("dave"), channel)
+        asyncio.run(run_slash_command(interaction, "debug"))
+        assert "debug mode on" in channel.sent
+        assert 1 == len(interaction.sent)
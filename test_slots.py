@@ -0,0 +1,54 @@
+import random
+from datetime import time, timedelta
+
+from players import AvailablePlayers
+from slots import SlotCounter, SlotWindow, common, common_start_time, first_slot
+from times import TimeRange
+from utils import time_today
+
+
+class TestSlots:
+    def test_bitmap(self):
+        now = time_today(time(hour=12))
+        window = SlotWindow(now)
+        assert now == window.origin
+        tr = TimeRange("in 10 minutes for 30 minutes", now=now)
+        assert 0b111111 << 2 == window.bitmap(tr)
+        # partly covered slots don't count
+        tr = TimeRange("in 12 minutes for 10 minutes", now=now)
+        assert 0b1 << 3 == window.bitmap(tr)
+        # clipped to the window
+        tr = TimeRange("for 100 hours", now=now)
+        assert window.slots == window.bitmap(tr).bit_count()
+
+    def test_common_start_time_matches_time_range(self):
+        now = time_today(time(hour=12))
+        window = SlotWindow(now)
+        ranges = [TimeRange(s, now=now) for s in ["5-10", "4-11", "3-12", "1-12", "2-10"]]
+        assert TimeRange.get_common_start_time(ranges) == common_start_time(ranges, window)
+        ranges.append(TimeRange("in 1 hour for 5 minutes", now=now))
+        assert common_start_time(ranges, window) is None
+        assert first_slot(common([])) is None
+
+    def test_counter(self):
+        rng = random.Random(4)
+        bitmaps = [rng.getrandbits(64) for _ in range(37)]
+        counter = SlotCounter(bitmaps)
+        expected = [sum((b >> s) & 1 for b in bitmaps) for s in range(64)]
+        assert expected == counter.counts(64)
+        for n in [1, 5, 18, 19, 30, 37, 38]:
+            at_least = counter.at_least(n)
+            assert [c >= n for c in expected] == [bool((at_least >> s) & 1) for s in range(64)]
+
+    def test_available_players(self):
+        now = time_today(time(hour=12))
+        window = SlotWindow(now)
+        players = AvailablePlayers()
+        players.add_player(1, TimeRange("for 1 hour", now=now))
+        players.add_player(2, TimeRange("in 30 minutes for 1 hour", now=now))
+        counts = players.headcount(window)
+        assert 1 == counts.count_at(0)
+        assert 2 == counts.count_at(window.slot_of(now + timedelta(minutes=45)))
+        assert {1, 2} == set(players.slot_bitmaps(window).keys())
+        players.delete(1)
+        assert {2} == set(players.slot_bitmaps(window).keys())
@@ -3,6 +3,8 @@ import logging
 from times import TimeRange, parse_time_string, parse_simple_timedelta_string
 from datetime import timedelta, datetime, time
 from utils import get_now_rounded, time_tomorrow, time_today, add_time_and_delta, strip_seconds, TimeSyntaxError, TZ
+from utils import get_now, get_zone, find_zone, use_tz
+from zoneinfo import ZoneInfoNotFoundError
 
 
 logger = logging.getLogger(__name__)
@@ -35,8 +37,8 @@ class TestTimeParsing:
         assert time(hour=20, minute=45) == add_time_and_delta(time(hour=18), timedelta(hours=2, minutes=45))
 
     def test_today(self):
-        assert strip_seconds(datetime.today().replace(tzinfo=TZ, hour=10, minute=0)) == time_today(time(hour=10))
-        assert strip_seconds(datetime.today().replace(tzinfo=TZ, hour=23, minute=0)) == time_today(time(hour=23))
+        assert strip_seconds(datetime.now(TZ).replace(hour=10, minute=0)) == time_today(time(hour=10))
+        assert strip_seconds(datetime.now(TZ).replace(hour=23, minute=0)) == time_today(time(hour=23))
 
     def test_time(self):
         assert (time(hour=10), True) == parse_time_string("10am")
@@ -213,3 +215,27 @@ class TestTimeRangeParsing:
             logger.error(e)
             raise e
 
+
+
+class TestTimeZones:
+    def test_parse_in_zone(self):
+        zone = get_zone("America/Vancouver")
+        with use_tz(zone):
+            now = time_today(time(hour=12))
+            trange = TimeRange("5-9", now=now)
+        assert zone == trange.start_time_available.tzinfo
+        assert datetime.combine(now.date(), time(hour=17), tzinfo=zone) == trange.start_time_available
+        assert timedelta(hours=4) == trange.duration_available
+        assert TZ == get_now().tzinfo  # back to the default outside the block
+
+    def test_today_is_in_zone(self):
+        # 02:00 UTC is still the previous evening in Toronto
+        now = datetime(2026, 3, 10, 2, 0, tzinfo=get_zone("UTC"))
+        with use_tz(TZ):
+            trange = TimeRange("7-9", now=now)
+        assert datetime(2026, 3, 9, 19, 0, tzinfo=TZ) == trange.start_time_available
+
+    def test_find_zone(self):
+        assert get_zone("America/Los_Angeles") is find_zone("america/los_angeles")
+        with pytest.raises(ZoneInfoNotFoundError):
+            find_zone("Mars/Olympus_Mons")
@@ -3,21 +3,21 @@ from typing import override
 from enum import IntEnum
 from datetime import timedelta, datetime, date, time
 from utils import (
-    add_plurals,
     TimeSyntaxError,
     set_tz_wrapper,
     round_time_wrapper,
     find_first_to_contain,
     strip_seconds,
-    time_today,
     get_now_rounded,
+    get_tz,
     fmt_dt,
     reverse_lookup,
 )
 
-hour_suffixes = list(reversed(sorted(add_plurals(["hr", "h", "hour", "hour"]))))
-minute_suffixes = list(reversed(sorted(add_plurals(["min", "minute", "m"]))))
-time_suffixes = hour_suffixes + minute_suffixes + ["am", "pm"]
+# checked in order with a substring test, so longer suffixes have to come before their prefixes
+hour_suffixes: tuple[str, ...] = ("hs", "hrs", "hr", "hours", "hour", "h")
+minute_suffixes: tuple[str, ...] = ("ms", "minutes", "minute", "mins", "min", "m")
+time_suffixes: frozenset[str] = frozenset((*hour_suffixes, *minute_suffixes, "am", "pm"))
 
 
 class TimeIndicatorType(IntEnum):
@@ -114,6 +114,8 @@ def parse_time_range_string(string: str, now: datetime | None = None) -> tuple[d
     """
     if now is None:
         now = get_now_rounded()
+    # "today" and the 6am rollover are about the wall clock where the player is
+    today: date = now.astimezone(get_tz()).date() if now.tzinfo is not None else now.date()
     indicators: dict[TimeIndicatorType, list[str]] = {
         TimeIndicatorType.StartTime: ["from", "at"],
         TimeIndicatorType.EndTime: ["until", "til", "till", "to"],
@@ -134,8 +136,8 @@ def parse_time_range_string(string: str, now: datetime | None = None) -> tuple[d
             raise TimeSyntaxError("couldn't parse a time range from this")
         fst_time, lock1 = r1
         snd_time, lock2 = r2
-        fst_date: datetime = datetime.combine(date.today(), fst_time)
-        snd_date: datetime = datetime.combine(date.today(), snd_time)
+        fst_date: datetime = datetime.combine(today, fst_time)
+        snd_date: datetime = datetime.combine(today, snd_time)
         if fst_time < snd_time < time(hour=6):
             fst_date += timedelta(days=1)  # if given a 3am, they probably mean the next day
         if snd_time < time(hour=6):
@@ -224,7 +226,7 @@ def parse_time_range_string(string: str, now: datetime | None = None) -> tuple[d
             pass  # not a valid duration
         raise TimeSyntaxError(f"Unrecognized word '{word}'")
     # time to datetime
-    [start_datetime, end_datetime] = map(lambda t: time_today(t) if t is not None else None, [start_time, end_time])
+    [start_datetime, end_datetime] = map(lambda t: datetime.combine(today, t) if t is not None else None, [start_time, end_time])
 
     # done figuring out string, get info from results
     return *parse_time_range_results(start_datetime, end_datetime, duration, delay, now=now), lock_end_time_am_pm
@@ -0,0 +1,52 @@
+"""
+Players are stored by user id. Names for display come from a small LRU of people who
+have used the bot recently, so the bot works without discord caching every member.
+"""
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_NAME_CACHE_SIZE: int = 1024
+
+
+class NameCache:
+    def __init__(self, maxsize: int = DEFAULT_NAME_CACHE_SIZE):
+        self.maxsize: int = maxsize
+        self.names: OrderedDict[int, str] = OrderedDict()
+
+    def remember(self, user: Any) -> None:
+        """
+        :param user: anything with `.id` and `.display_name` (or `.name`), like a discord User or Member
+        """
+        self.names[user.id] = getattr(user, "display_name", None) or user.name
+        self.names.move_to_end(user.id)
+        if len(self.names) > self.maxsize:
+            self.names.popitem(last=False)
+
+    def get(self, user_id: int) -> str | None:
+        name = self.names.get(user_id)
+        if name is not None:
+            self.names.move_to_end(user_id)
+        return name
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+g_names: NameCache = NameCache()
+
+
+def remember_user(user: Any) -> int:
+    """
+    Note the user's name for later and return their id
+    """
+    g_names.remember(user)
+    return user.id
+
+
+def display_name(user_id: int) -> str:
+    name = g_names.get(user_id)
+    return name if name is not None else f"user {user_id}"
+
+
+def mention(user_id: int) -> str:
+    return f"<@{user_id}>"
@@ -1,9 +1,69 @@
 from datetime import datetime, timedelta, time, date
 import zoneinfo
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import Any, TypeVar, Callable, override
 from collections.abc import Iterable
 
-TZ = zoneinfo.ZoneInfo(key="America/Toronto")
+DEFAULT_TZ_KEY = "America/Toronto"
+
+
+@lru_cache(maxsize=None)
+def get_zone(key: str) -> zoneinfo.ZoneInfo:
+    """
+    :raises zoneinfo.ZoneInfoNotFoundError: for names that aren't in the tz database
+    """
+    return zoneinfo.ZoneInfo(key=key)
+
+
+@lru_cache(maxsize=1)
+def _zone_keys_by_lowercase() -> dict[str, str]:
+    return {key.lower(): key for key in zoneinfo.available_timezones()}
+
+
+def find_zone(name: str) -> zoneinfo.ZoneInfo:
+    """
+    Case-insensitive `get_zone`, for names typed into discord
+    :raises zoneinfo.ZoneInfoNotFoundError: for names that aren't in the tz database
+    """
+    key = _zone_keys_by_lowercase().get(name.strip().lower())
+    if key is None:
+        raise zoneinfo.ZoneInfoNotFoundError(f"No time zone found with key {name}")
+    return get_zone(key)
+
+
+TZ = get_zone(DEFAULT_TZ_KEY)
+# the zone of whoever we're parsing times for, see `use_tz`
+_current_tz: ContextVar[zoneinfo.ZoneInfo | None] = ContextVar("current_tz", default=None)
+
+
+def get_tz() -> zoneinfo.ZoneInfo:
+    return _current_tz.get() or TZ
+
+
+def set_default_tz(key: str) -> None:
+    global TZ
+    TZ = get_zone(key)
+
+
+class use_tz:
+    """
+    Make "now", "today" and every parsed time inside this block use `zone`.
+    Safe across tasks, each one gets its own copy of the context.
+    (a class rather than @contextmanager because this wraps every parse)
+    """
+
+    __slots__ = ("zone", "token")
+
+    def __init__(self, zone: zoneinfo.ZoneInfo):
+        self.zone: zoneinfo.ZoneInfo = zone
+
+    def __enter__(self) -> zoneinfo.ZoneInfo:
+        self.token = _current_tz.set(self.zone)
+        return self.zone
+
+    def __exit__(self, *_exc) -> None:
+        _current_tz.reset(self.token)
 
 
 class TimeSyntaxError(RuntimeError):
@@ -97,7 +157,8 @@ def round_time_wrapper(f: Callable[..., Any]):
 def set_tz_wrapper(f: Callable[..., Any]):
     def wrapper(*args, **kwargs):
         result = f(*args, **kwargs)
-        result = apply_func_to_timelike_var(result, lambda t: t.replace(tzinfo=TZ))
+        tz = get_tz()
+        result = apply_func_to_timelike_var(result, lambda t: t.replace(tzinfo=tz))
         return result
 
     return wrapper
@@ -126,23 +187,21 @@ def find_first_to_contain(first, iterable: Iterable[E]) -> E | None:
 @round_time_wrapper
 def time_today(t: time) -> datetime:
     """
-    Make a datetime with today's date and the provided time
+    Make a datetime with today's date (in the current zone) and the provided time
     :param t: The time of day
     :return: datetime
     """
-    return datetime.combine(date.today(), t)
+    return datetime.combine(get_now().date(), t)
 
 
 def time_tomorrow(t: time) -> datetime:
     return time_today(t) + timedelta(days=1)
 
 
-@set_tz_wrapper
 @round_time_wrapper
 def get_now_rounded() -> datetime:
-    return datetime.now()
+    return datetime.now(get_tz())
 
 
-@set_tz_wrapper
 def get_now() -> datetime:
-    return datetime.now()
+    return datetime.now(get_tz())